@@ -29,6 +29,18 @@ from src.visuals import (
     plot_area_plot_orca_sightings,
 )
 
+from src.analysis import (
+    DAM_COUNT_COLUMNS,
+    ORCA_SIGHTING_COLUMNS,
+    resolve_data_path,
+    query_dam_count_options,
+    query_dam_count_preview,
+    query_dam_counts,
+    query_orca_sighting_options,
+    query_orca_sighting_preview,
+    query_orca_sightings,
+)
+
 from src.auth import check_password_user
 
 if not check_password_user():
@@ -98,87 +110,17 @@ def load_columbia_river_data():
     return columbia_river_mouth, river_gdf, dams
 
 
-# Load Dam Counts
-@st.cache_data
-def load_dam_counts(dam_count_directory):
-    if os.path.exists(dam_count_directory):
-        dam_counts_df = pd.read_parquet(dam_count_directory)
-
-        # Standardize Columns
-        dam_counts_df.columns = dam_counts_df.columns.str.upper()
-
-    elif os.path.exists(f"../{dam_count_directory}"):
-        dam_counts_df = pd.read_parquet(f"../{dam_count_directory}")
-
-        # Standardize Columns
-        dam_counts_df.columns = dam_counts_df.columns.str.upper()
-
-    else:
-        return st.write("DAM COUNTS UNAVAILABLE")
-
-    return dam_counts_df
-
-
-# Load Orca Sighting Counts
-@st.cache_data
-def load_orca_sightings(orca_sightings_count_directory):
-    if os.path.exists(orca_sightings_count_directory):
-        orca_sightings_df = pd.read_parquet(orca_sightings_count_directory)
-
-        # Standardize Columns
-        orca_sightings_df.columns = orca_sightings_df.columns.str.upper()
-
-        # Convert to Geospatial DataSet
-        orca_sightings_df = gpd.GeoDataFrame(
-            orca_sightings_df,
-            geometry=gpd.points_from_xy(
-                orca_sightings_df.LONGITUDE, orca_sightings_df.LATITUDE
-            ),
-            crs="EPSG:4326",  # WGS84 lat/lon
-        )
-
-    elif os.path.exists(f"../{orca_sightings_count_directory}"):
-        orca_sightings_df = pd.read_parquet(f"../{orca_sightings_count_directory}")
-
-        # Standardize Columns
-        orca_sightings_df.columns = orca_sightings_df.columns.str.upper()
-
-        # Convert to Geospatial DataSet
-        orca_sightings_df = gpd.GeoDataFrame(
-            orca_sightings_df,
-            geometry=gpd.points_from_xy(
-                orca_sightings_df.LONGITUDE, orca_sightings_df.LATITUDE
-            ),
-            crs="EPSG:4326",  # WGS84 lat/lon
-        )
-
-    else:
-        return st.write("ORCA SIGHTING DATA UNAVAILABLE")
-
-    return orca_sightings_df
-
-
-def get_filters_for_dam_data(dam_counts_df):
-    column_list = [
-        "DOY",
-        "WOY",
-        "MONTH",
-        "YEAR",
-        "YEAR_MONTH",
-        "DATE",
-        "LOCATION",
-        "SPECIES",
-        "COUNT",
-        "DOY_ZSCORE",
-    ]
-    dam_counts_df = dam_counts_df[column_list]
+def get_filters_for_dam_data(
+    dam_count_directory, dam_locations, dam_count_rollup_directory=None
+):
+    column_list = DAM_COUNT_COLUMNS
 
     ### ----------------------
     ### Select X-Axis
     x_axis_select = st.selectbox(
         "Select X-Axis",
         options=["DOY"]
-        + [i for i in dam_counts_df.columns if i not in ["COUNT", "DOY_ZSCORE", "DOY"]],
+        + [i for i in column_list if i not in ["COUNT", "DOY_ZSCORE", "DOY"]],
         index=0,
         key=9800,
     )
@@ -196,7 +138,7 @@ def get_filters_for_dam_data(dam_counts_df):
     ### ----------------------
     ### Select Aggregater Cols
     column_options_agg = list(
-        set(dam_counts_df.columns) - set(["LAT", "LON", "TYPE", "geometry"])
+        set(column_list) - set(["LAT", "LON", "TYPE", "geometry"])
     )
 
     if aggregate == True:
@@ -220,6 +162,7 @@ def get_filters_for_dam_data(dam_counts_df):
 
     else:
         agg_options = set(column_options_agg)
+        agg_func_option = None
         color_by_agg_option = None
 
     ### ----------------------
@@ -227,10 +170,14 @@ def get_filters_for_dam_data(dam_counts_df):
     data_filter = st.toggle("Filter Data?", value=False, key=9806)
 
     ## Select Species
-    species_options = sorted(list(dam_counts_df.SPECIES.unique()))
+    species_options = query_dam_count_options(
+        dam_count_directory, dam_locations, "SPECIES"
+    )
 
     # Select Dams
-    dam_options = sorted(list(dam_counts_df.LOCATION.unique()))
+    dam_options = query_dam_count_options(
+        dam_count_directory, dam_locations, "LOCATION"
+    )
 
     if data_filter == True:
         # Species Select
@@ -245,33 +192,18 @@ def get_filters_for_dam_data(dam_counts_df):
         selected_species = species_options
         selected_dams = dam_options
 
-    # Prepare Data for Plot
-    ## Subset Columbs
-    column_list = list(
-        set(["LOCATION", "SPECIES", y_axis_select, x_axis_select]) | agg_options
+    # Filter + Aggregate (DuckDB)
+    plot_data = query_dam_counts(
+        dam_count_directory,
+        dam_locations,
+        x_axis_select,
+        y_axis_select,
+        list(agg_options),
+        agg_func_option,
+        selected_species,
+        selected_dams,
+        rollup_directory=dam_count_rollup_directory,
     )
-    plot_data = dam_counts_df[column_list]
-
-    ## Filter Data
-    plot_data = plot_data[
-        (plot_data.SPECIES.isin(selected_species))
-        & (plot_data.LOCATION.isin(selected_dams))
-    ]
-
-    ## Aggregate
-    agg_list = list(set([x_axis_select]) | agg_options)
-
-    if agg_func_option == "Mean":
-        plot_data = plot_data.groupby(agg_list, as_index=False)[y_axis_select].mean()
-    elif agg_func_option == "Median":
-        plot_data = plot_data.groupby(agg_list, as_index=False)[y_axis_select].median()
-    elif agg_func_option == "Sum":
-        plot_data = plot_data.groupby(agg_list, as_index=False)[y_axis_select].sum()
-    elif agg_func_option == "Standard Deviation":
-        plot_data = plot_data.groupby(agg_list, as_index=False)[y_axis_select].std()
-
-    plot_data = plot_data.sort_values(x_axis_select)
-    plot_data = plot_data.reset_index(drop=True)
 
     # Build UID for Plotting
     col_for_uid = list(agg_options - set([y_axis_select, x_axis_select]))
@@ -289,23 +221,8 @@ def get_filters_for_dam_data(dam_counts_df):
     )
 
 
-def get_filters_for_orca_sightings_data(orca_sightings_df):
-    column_list = [
-        "DOY",
-        "WOY",
-        "MONTH",
-        "YEAR",
-        "YEAR_MONTH",
-        "DATE",
-        "LATITUDE",
-        "LONGITUDE",
-        "POD_TYPE",
-        "POD_TAG",
-        "COUNT",
-        "geometry",
-    ]
-    # Subset Sightings Data
-    orca_sightings_df = orca_sightings_df[column_list]
+def get_filters_for_orca_sightings_data(orca_sightings_directory):
+    column_list = ORCA_SIGHTING_COLUMNS
 
     ### ----------------------
     ### Select X-Axis
@@ -313,9 +230,7 @@ def get_filters_for_orca_sightings_data(orca_sightings_df):
         "Select X-Axis",
         options=["DOY"]
         + [
-            i
-            for i in orca_sightings_df.columns
-            if i not in ["COUNT", "LATITUDE", "LONGITUDE", "DOY"]
+            i for i in column_list if i not in ["COUNT", "LATITUDE", "LONGITUDE", "DOY"]
         ],
         index=0,
         key=9900,
@@ -332,7 +247,7 @@ def get_filters_for_orca_sightings_data(orca_sightings_df):
     ### ----------------------
     ### Select Aggregater Cols
     column_options_agg = list(
-        set(orca_sightings_df.columns) - set(["LATITUDE", "LONGITUDE", "geometry"])
+        set(column_list) - set(["LATITUDE", "LONGITUDE", "geometry"])
     )
 
     if aggregate == True:
@@ -356,6 +271,7 @@ def get_filters_for_orca_sightings_data(orca_sightings_df):
 
     else:
         agg_options = set(column_options_agg)
+        agg_func_option = None
         color_by_agg_option = None
 
     ### ----------------------
@@ -363,10 +279,10 @@ def get_filters_for_orca_sightings_data(orca_sightings_df):
     data_filter = st.toggle("Filter Data?", value=False, key=9706)
 
     ## Select Pod Type
-    pod_type_options = sorted(list(orca_sightings_df.POD_TYPE.unique()))
+    pod_type_options = query_orca_sighting_options(orca_sightings_directory, "POD_TYPE")
 
     ## Select Pod Tag
-    pod_tag_options = sorted(list(orca_sightings_df.POD_TAG.unique()))
+    pod_tag_options = query_orca_sighting_options(orca_sightings_directory, "POD_TAG")
 
     if data_filter == True:
         # Pod Type Select
@@ -386,32 +302,16 @@ def get_filters_for_orca_sightings_data(orca_sightings_df):
         selected_pod_type = pod_type_options
         selected_pod_tag = pod_tag_options
 
-    # Prepare Data for Plot
-    ## Subset Columbs
-    column_list = list(
-        set(["POD_TYPE", "POD_TAG", "geometry", y_axis_select, x_axis_select])
-        | agg_options
-    )
-    plot_data = orca_sightings_df[column_list]
-
-    ## Filter Data
-    plot_data = plot_data[
-        (plot_data.POD_TYPE.isin(selected_pod_type))
-        & (plot_data.POD_TAG.isin(selected_pod_tag))
-    ]
-
-    if len(plot_data) == 0:
-        st.warning("Filters Resulted in No Observations.", icon="⚠️")
-
     ## Spatial Filter
     spatial_filter = st.toggle("Spatially Filter Data?", value=True, key=9710)
 
-    if spatial_filter == True and len(plot_data) > 0:
+    if spatial_filter == True:
         selected_latitude = st.number_input("Set Latitude", value=46.2167)
         selected_longitude = st.number_input("Set Longitude", value=-123.9333)
         selected_buffer_distance = st.number_input(
             "Define Radius of Filter (KM)", min_value=None, max_value=None, value=100
         )
+        spatial_center = (selected_latitude, selected_longitude)
 
         # Step 1: Make GeoDataFrame in EPSG:4326
         area_filter = gpd.GeoDataFrame(
@@ -425,32 +325,31 @@ def get_filters_for_orca_sightings_data(orca_sightings_df):
             selected_buffer_distance * 1000
         )
 
-        # Step 4: Back to EPSG:4326 (lat/lon degrees)
+        # Step 4: Back to EPSG:4326 (lat/lon degrees) - map display only
         area_filter = area_filter.to_crs(epsg=4326)
 
         selected_area = area_filter.copy()
-        plot_data = plot_data.sjoin(area_filter)
-
-        if len(plot_data) == 0:
-            st.warning("Filters Resulted in No Observations.", icon="⚠️")
 
     else:
+        spatial_center = None
+        selected_buffer_distance = None
         selected_area = None
 
-    ## Aggregate
-    agg_list = list(set([x_axis_select]) | agg_options)
-
-    if agg_func_option == "Mean":
-        plot_data = plot_data.groupby(agg_list, as_index=False)[y_axis_select].mean()
-    elif agg_func_option == "Median":
-        plot_data = plot_data.groupby(agg_list, as_index=False)[y_axis_select].median()
-    elif agg_func_option == "Sum":
-        plot_data = plot_data.groupby(agg_list, as_index=False)[y_axis_select].sum()
-    elif agg_func_option == "Standard Deviation":
-        plot_data = plot_data.groupby(agg_list, as_index=False)[y_axis_select].std()
+    # Filter + Aggregate (DuckDB, spatial filter as great-circle distance)
+    plot_data = query_orca_sightings(
+        orca_sightings_directory,
+        x_axis_select,
+        y_axis_select,
+        list(agg_options),
+        agg_func_option,
+        selected_pod_type,
+        selected_pod_tag,
+        center=spatial_center,
+        radius_km=selected_buffer_distance,
+    )
 
-    plot_data = plot_data.sort_values(x_axis_select)
-    plot_data = plot_data.reset_index(drop=True)
+    if len(plot_data) == 0:
+        st.warning("Filters Resulted in No Observations.", icon="⚠️")
 
     # Build UID for Plotting
     col_for_uid = list(agg_options - set([y_axis_select, x_axis_select]))
@@ -480,6 +379,9 @@ st.set_page_config(page_title="Columbia River Analysis", layout="wide")
 # Dam Counts Direcotry - FPC
 dam_count_directory = "./data/processed/FPC_DAM_COUNTS/"
 
+# Dam Count Rollups Directory - built from FPC_DAM_COUNTS
+dam_count_rollup_directory = "./data/processed/FPC_DAM_COUNTS_ROLLUPS/"
+
 # Orca Sightings Directory - Acartia + TWM
 orca_sightings_count_directory = "./data/processed/ORCA_SIGHTINGS/"
 
@@ -492,12 +394,19 @@ orca_sightings_count_directory = "./data/processed/ORCA_SIGHTINGS/"
 # Load Spatial Layers
 columbia_river_mouth, river_gdf, dams = load_columbia_river_data()
 
-# Load Dam Counts
-dam_counts_df = load_dam_counts(dam_count_directory)
-dam_counts_df = pd.merge(dam_counts_df, dams.drop(columns=["geometry"]), on=["DAM"])
+# Dam Counts - queried on demand (DuckDB), joined to dam attributes
+dam_count_directory = resolve_data_path(dam_count_directory)
+dam_count_rollup_directory = resolve_data_path(dam_count_rollup_directory)
+dam_locations = pd.DataFrame(dams.drop(columns=["geometry"]))
+
+if dam_count_directory is None:
+    st.write("DAM COUNTS UNAVAILABLE")
+
+# Orca Sightings - queried on demand (DuckDB)
+orca_sightings_count_directory = resolve_data_path(orca_sightings_count_directory)
 
-# Load Orca Sightings
-orca_sightings_df = load_orca_sightings(orca_sightings_count_directory)
+if orca_sightings_count_directory is None:
+    st.write("ORCA SIGHTING DATA UNAVAILABLE")
 
 
 #                                                         #
@@ -640,7 +549,7 @@ elif current_page == "Analysis":
 
         # Show Table
         if plot_selection == 3:
-            st.table(dam_counts_df.head(25))
+            st.table(query_dam_count_preview(dam_count_directory, dam_locations))
 
         # Allow for Data Analysis
         elif plot_selection is not None:
@@ -654,7 +563,9 @@ elif current_page == "Analysis":
                     y_axis_select,
                     agg_options,
                     color_by_agg_option,
-                ) = get_filters_for_dam_data(dam_counts_df)
+                ) = get_filters_for_dam_data(
+                    dam_count_directory, dam_locations, dam_count_rollup_directory
+                )
 
             agree = st.checkbox("Proceed with Plotting Dam Counts")
 
@@ -761,7 +672,7 @@ elif current_page == "Analysis":
 
         # Show Table
         if plot_selection == 3:
-            st.table(orca_sightings_df.head(25))
+            st.table(query_orca_sighting_preview(orca_sightings_count_directory))
 
         else:
             # Data Selection for Plots
@@ -775,7 +686,7 @@ elif current_page == "Analysis":
                     y_axis_select,
                     agg_options,
                     color_by_agg_option,
-                ) = get_filters_for_orca_sightings_data(orca_sightings_df)
+                ) = get_filters_for_orca_sightings_data(orca_sightings_count_directory)
 
             agree = st.checkbox("Proceed with Plotting Orca Sighting Counts", key=9700)
 
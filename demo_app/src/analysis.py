@@ -0,0 +1,549 @@
+# ------------------------------------------------------- #
+#                         MODULES                         #
+
+# Standard Modules
+import json
+import os
+
+# Third-Party Modules
+import duckdb
+import streamlit as st
+
+#                                                         #
+# ------------------------------------------------------- #
+
+# ------------------------------------------------------- #
+#                        PARAMETERS                       #
+
+# Queryable Columns - Dam Counts (FPC + Dam Locations)
+DAM_COUNT_COLUMNS = [
+    "DOY",
+    "WOY",
+    "MONTH",
+    "YEAR",
+    "YEAR_MONTH",
+    "DATE",
+    "LOCATION",
+    "SPECIES",
+    "COUNT",
+    "DOY_ZSCORE",
+]
+
+# Queryable Columns - Orca Sightings
+ORCA_SIGHTING_COLUMNS = [
+    "DOY",
+    "WOY",
+    "MONTH",
+    "YEAR",
+    "YEAR_MONTH",
+    "DATE",
+    "LATITUDE",
+    "LONGITUDE",
+    "POD_TYPE",
+    "POD_TAG",
+    "COUNT",
+]
+
+# Persisted Category Sets (written next to the processed data)
+CATEGORIES_FILE = "_categories.json"
+
+# Aggregations (matching pandas groupby mean/median/sum/std)
+AGG_FUNCTIONS = {
+    "Mean": "AVG({y})",
+    "Median": "MEDIAN({y})",
+    "Sum": "COALESCE(SUM({y}), 0)",
+    "Standard Deviation": "STDDEV_SAMP({y})",
+}
+
+# Dam Count Rollups - grain columns per rollup (always + LOCATION, SPECIES)
+DAM_COUNT_ROLLUPS = {
+    "DOY": ["DOY"],
+    "WOY": ["WOY"],
+    "YEAR_MONTH": ["YEAR", "MONTH", "YEAR_MONTH"],
+    "YEAR_WOY": ["YEAR", "WOY"],
+}
+DAM_COUNT_ROLLUP_KEYS = ["LOCATION", "SPECIES"]
+DAM_COUNT_ROLLUP_VALUES = ["COUNT", "DOY_ZSCORE"]
+
+# Rollup Aggregations (merging count / sum / M2 partials)
+ROLLUP_AGG_FUNCTIONS = {
+    "Mean": "SUM({y}_SUM) / NULLIF(SUM({y}_N), 0)",
+    "Sum": "COALESCE(SUM({y}_SUM), 0)",
+    # Chan merge: within-row M2 + spread of row means around the merged mean
+    "Standard Deviation": (
+        "CASE WHEN SUM({y}_N) > 1 THEN SQRT((SUM({y}_M2) + "
+        "SUM({y}_N * POW({y}_SUM / NULLIF({y}_N, 0) - {y}_MERGED_MEAN, 2))"
+        ") / (SUM({y}_N) - 1)) END"
+    ),
+    # Medians do not merge - only answered at the rollup's own grain
+    "Median": "MIN({y}_MEDIAN)",
+}
+
+#                                                         #
+# ------------------------------------------------------- #
+
+# ------------------------------------------------------- #
+#                        FUNCTIONS                        #
+
+#############################
+## QUERY HELPERS
+
+
+# Resolve Data Directory (app run from repo root or demo_app/)
+def resolve_data_path(path):
+    if os.path.exists(path):
+        return path
+    elif os.path.exists(f"../{path}"):
+        return f"../{path}"
+    return None
+
+
+# Parquet Scan Over a Processed Directory
+def _parquet_scan(directory):
+    return f"read_parquet('{os.path.join(directory, '**', '*.parquet')}', union_by_name = true)"
+
+
+# Quote Column Identifiers (columns must come from the allowed list)
+def _quote(col, allowed_columns):
+    if col not in allowed_columns:
+        raise ValueError(f"Unsupported column: {col}")
+    return f'"{col}"'
+
+
+# Value Expression - NaN treated as missing, as in pandas
+def _value_expression(col):
+    return f'CASE WHEN isnan(CAST("{col}" AS DOUBLE)) THEN NULL ELSE CAST("{col}" AS DOUBLE) END'
+
+
+# Persisted Category Set for a Column (None when not written)
+def _persisted_categories(directory, column):
+    categories_path = os.path.join(directory, CATEGORIES_FILE)
+    if not os.path.exists(categories_path):
+        return None
+    with open(categories_path) as f:
+        categories = json.load(f).get(column)
+    return None if categories is None else sorted(categories)
+
+
+# Membership Filter (empty selections match nothing, as with pandas isin)
+def _isin_filter(col, values, name, params):
+    if len(values) == 0:
+        return "FALSE"
+    params[name] = list(values)
+    return f'list_contains(${name}, "{col}")'
+
+
+# Build Parameterized Aggregation
+def _build_aggregation_sql(
+    source_sql,
+    allowed_columns,
+    x_axis,
+    y_axis,
+    group_cols,
+    agg_func,
+    where,
+    params,
+    agg_sql=None,
+):
+    group_cols = sorted(set([x_axis]) | set(group_cols))
+    group_sql = ", ".join(_quote(col, allowed_columns) for col in group_cols)
+    _quote(y_axis, allowed_columns)
+
+    # Pandas groupby drops missing keys
+    key_filters = [f"{_quote(col, allowed_columns)} IS NOT NULL" for col in group_cols]
+    where_sql = " AND ".join(where + key_filters)
+
+    if agg_func is None:
+        # No aggregation - return the filtered rows
+        select_sql = ", ".join(
+            _quote(col, allowed_columns) for col in sorted(set(group_cols) | {y_axis})
+        )
+        sql = (
+            f"SELECT {select_sql} FROM ({source_sql}) "
+            f"WHERE {' AND '.join(where)} "
+            f"ORDER BY {_quote(x_axis, allowed_columns)}"
+        )
+        return sql, params
+
+    if agg_sql is None:
+        agg_sql = AGG_FUNCTIONS[agg_func].format(y=_value_expression(y_axis))
+
+    sql = (
+        f'SELECT {group_sql}, {agg_sql} AS "{y_axis}" '
+        f"FROM ({source_sql}) "
+        f"WHERE {where_sql} "
+        f"GROUP BY {group_sql} "
+        f"ORDER BY {_quote(x_axis, allowed_columns)}, {group_sql}"
+    )
+    return sql, params
+
+
+# Dam Counts Source - FPC Counts Joined to Dam Attributes
+def _dam_counts_source(dam_count_directory):
+    # Alias columns to upper case (file columns may be lower case)
+    select_sql = ", ".join(f'"{col}" AS "{col}"' for col in DAM_COUNT_COLUMNS)
+    return (
+        f"SELECT {select_sql} FROM {_parquet_scan(dam_count_directory)} "
+        f'JOIN dam_locations USING ("DAM")'
+    )
+
+
+# Orca Sightings Source
+def _orca_sightings_source(orca_sightings_directory):
+    select_sql = ", ".join(f'"{col}" AS "{col}"' for col in ORCA_SIGHTING_COLUMNS)
+    return f"SELECT {select_sql} FROM {_parquet_scan(orca_sightings_directory)}"
+
+
+#############################
+## COLUMBIA RIVER - DAM COUNT ROLLUPS
+
+
+# Build Materialized Rollups (offline, after FPC_DAM_COUNTS is refreshed)
+def build_dam_count_rollups(
+    dam_count_directory, dam_locations, rollup_directory, rollups=DAM_COUNT_ROLLUPS
+):
+    """
+    Precompute mergeable dam count rollups for the Columbia River page.
+
+    Each rollup groups the daily counts (joined to the dam locations as on the
+    page) by LOCATION, SPECIES and its grain columns, and stores per value
+    column the non-missing count, sum, M2 (sum of squared deviations from
+    the row mean) and exact median. Coarser queries merge count/sum/M2;
+    medians are only served at a rollup's own grain.
+
+    Parameters:
+        dam_count_directory (str): Processed FPC_DAM_COUNTS parquet directory.
+        dam_locations (pd.DataFrame): Dam attributes (no geometry) keyed by DAM.
+        rollup_directory (str): Output directory (one parquet per rollup).
+        rollups (dict): Rollup name -> grain columns.
+
+    Returns:
+        list: Paths of the written rollups (other rollups in the directory,
+        e.g. from an earlier configuration, are removed).
+    """
+    os.makedirs(rollup_directory, exist_ok=True)
+
+    # Drop rollups no longer configured so queries never pick them up
+    for file_name in os.listdir(rollup_directory):
+        name, extension = os.path.splitext(file_name)
+        if extension == ".parquet" and name not in rollups:
+            os.remove(os.path.join(rollup_directory, file_name))
+
+    stats_sql = ", ".join(
+        f'COUNT({_value_expression(y)}) AS "{y}_N", '
+        f'COALESCE(SUM({_value_expression(y)}), 0) AS "{y}_SUM", '
+        f"COALESCE(VAR_POP({_value_expression(y)}) "
+        f'* COUNT({_value_expression(y)}), 0) AS "{y}_M2", '
+        f'MEDIAN({_value_expression(y)}) AS "{y}_MEDIAN"'
+        for y in DAM_COUNT_ROLLUP_VALUES
+    )
+
+    rollup_paths = []
+    with duckdb.connect() as con:
+        con.register("dam_locations", dam_locations)
+
+        for name, grain in rollups.items():
+            keys = DAM_COUNT_ROLLUP_KEYS + list(grain)
+            key_sql = ", ".join(_quote(col, DAM_COUNT_COLUMNS) for col in keys)
+            rollup_path = os.path.join(rollup_directory, f"{name}.parquet")
+
+            # Write to a temporary file first so readers never see a partial rollup
+            con.execute(
+                f"COPY (SELECT {key_sql}, {stats_sql} "
+                f"FROM ({_dam_counts_source(dam_count_directory)}) "
+                f"GROUP BY {key_sql} ORDER BY {key_sql}) "
+                f"TO '{rollup_path}.tmp' (FORMAT PARQUET)"
+            )
+            os.replace(f"{rollup_path}.tmp", rollup_path)
+            rollup_paths.append(rollup_path)
+
+    return rollup_paths
+
+
+# Rollup Files With Their Modification Times (cache key)
+def _rollup_file_stamps(rollup_directory):
+    if rollup_directory is None or not os.path.exists(rollup_directory):
+        return ()
+    return tuple(
+        (file_name, os.path.getmtime(os.path.join(rollup_directory, file_name)))
+        for file_name in sorted(os.listdir(rollup_directory))
+        if file_name.endswith(".parquet")
+    )
+
+
+# List Available Rollups (smallest first) - re-read when a rollup file changes
+def list_dam_count_rollups(rollup_directory):
+    return _list_dam_count_rollups(
+        rollup_directory, _rollup_file_stamps(rollup_directory)
+    )
+
+
+# Read Rollup Metadata (cached per set of rollup files and mtimes)
+@st.cache_data
+def _list_dam_count_rollups(rollup_directory, file_stamps):
+    rollups = []
+    with duckdb.connect() as con:
+        for file_name, _ in file_stamps:
+            rollup_path = os.path.join(rollup_directory, file_name)
+            n_rows = con.execute(
+                "SELECT SUM(num_rows) FROM parquet_file_metadata(?)", [rollup_path]
+            ).fetchone()[0]
+            columns = con.execute(
+                f"DESCRIBE SELECT * FROM read_parquet('{rollup_path}')"
+            ).df()["column_name"]
+            keys = [col for col in columns if col in DAM_COUNT_COLUMNS]
+            rollups.append((rollup_path, keys, n_rows))
+
+    return sorted(rollups, key=lambda rollup: rollup[2])
+
+
+# Rollup Rows With Their Output Group's Merged Mean (centre for the std merge)
+def _with_merged_mean(source_sql, y, group_cols, where):
+    partition_sql = ", ".join(
+        _quote(col, DAM_COUNT_COLUMNS) for col in sorted(group_cols)
+    )
+    return (
+        f'SELECT *, SUM("{y}_SUM") OVER w / NULLIF(SUM("{y}_N") OVER w, 0) '
+        f'AS "{y}_MERGED_MEAN" FROM ({source_sql}) '
+        f"WHERE {' AND '.join(where)} "
+        f"WINDOW w AS (PARTITION BY {partition_sql})"
+    )
+
+
+# Pick the Smallest Rollup Covering a Query
+def _select_dam_count_rollup(rollup_directory, query_cols, agg_func):
+    for rollup_path, keys, n_rows in list_dam_count_rollups(rollup_directory):
+        # Rollups always keep the filter columns (LOCATION, SPECIES)
+        if agg_func == "Median" and set(keys) != set(query_cols):
+            continue
+        if set(query_cols) | set(DAM_COUNT_ROLLUP_KEYS) <= set(keys):
+            return rollup_path
+    return None
+
+
+#############################
+## COLUMBIA RIVER - DAM COUNTS
+
+
+# Distinct Values for Filter Widgets
+@st.cache_data
+def query_dam_count_options(dam_count_directory, dam_locations, column):
+    categories = _persisted_categories(dam_count_directory, column)
+    if categories is not None:
+        return categories
+
+    with duckdb.connect() as con:
+        con.register("dam_locations", dam_locations)
+        col = _quote(column, DAM_COUNT_COLUMNS)
+        return (
+            con.execute(
+                f"SELECT DISTINCT {col} FROM ({_dam_counts_source(dam_count_directory)}) "
+                f"WHERE {col} IS NOT NULL ORDER BY {col}"
+            )
+            .df()[column]
+            .tolist()
+        )
+
+
+# Preview Rows for Table View
+@st.cache_data
+def query_dam_count_preview(dam_count_directory, dam_locations, n_rows=25):
+    with duckdb.connect() as con:
+        con.register("dam_locations", dam_locations)
+        preview_df = con.execute(
+            f"SELECT * FROM {_parquet_scan(dam_count_directory)} "
+            f'JOIN dam_locations USING ("DAM") LIMIT ?',
+            [n_rows],
+        ).df()
+
+    # Standardize Columns
+    preview_df.columns = preview_df.columns.str.upper()
+    return preview_df
+
+
+# Filter + Aggregate Dam Counts
+@st.cache_data
+def query_dam_counts(
+    dam_count_directory,
+    dam_locations,
+    x_axis,
+    y_axis,
+    group_cols,
+    agg_func,
+    species,
+    locations,
+    rollup_directory=None,
+):
+    """
+    Filter and aggregate FPC dam counts in a single DuckDB query.
+
+    Answered from the smallest materialized rollup covering the grouping
+    (see `build_dam_count_rollups`), falling back to the daily counts.
+
+    Parameters:
+        dam_count_directory (str): Processed FPC_DAM_COUNTS parquet directory.
+        dam_locations (pd.DataFrame): Dam attributes (no geometry) keyed by DAM.
+        x_axis (str): X-axis column (always part of the grouping).
+        y_axis (str): Value column to aggregate.
+        group_cols (list): Additional grouping columns.
+        agg_func (str or None): "Mean", "Median", "Sum", "Standard Deviation"
+            or None for unaggregated rows.
+        species (list): Species to keep.
+        locations (list): Dam locations to keep.
+        rollup_directory (str, optional): Directory of materialized rollups.
+
+    Returns:
+        pd.DataFrame: Aggregated rows sorted by the x-axis.
+    """
+    params = {}
+    where = [
+        _isin_filter("SPECIES", species, "species", params),
+        _isin_filter("LOCATION", locations, "locations", params),
+    ]
+
+    # Rollup Path
+    rollup_path = None
+    if agg_func is not None and y_axis in DAM_COUNT_ROLLUP_VALUES:
+        rollup_path = _select_dam_count_rollup(
+            rollup_directory, set([x_axis]) | set(group_cols), agg_func
+        )
+
+    if rollup_path is not None:
+        source_sql = f"SELECT * FROM read_parquet('{rollup_path}')"
+        if agg_func == "Standard Deviation":
+            source_sql = _with_merged_mean(
+                source_sql, y_axis, set([x_axis]) | set(group_cols), where
+            )
+
+        sql, params = _build_aggregation_sql(
+            source_sql,
+            DAM_COUNT_COLUMNS,
+            x_axis,
+            y_axis,
+            group_cols,
+            agg_func,
+            where,
+            params,
+            agg_sql=ROLLUP_AGG_FUNCTIONS[agg_func].format(y=y_axis),
+        )
+        with duckdb.connect() as con:
+            return con.execute(sql, params).df()
+
+    sql, params = _build_aggregation_sql(
+        _dam_counts_source(dam_count_directory),
+        DAM_COUNT_COLUMNS,
+        x_axis,
+        y_axis,
+        group_cols,
+        agg_func,
+        where,
+        params,
+    )
+
+    with duckdb.connect() as con:
+        con.register("dam_locations", dam_locations)
+        return con.execute(sql, params).df()
+
+
+#############################
+## COLUMBIA RIVER - ORCA SIGHTINGS
+
+
+# Distinct Values for Filter Widgets
+@st.cache_data
+def query_orca_sighting_options(orca_sightings_directory, column):
+    col = _quote(column, ORCA_SIGHTING_COLUMNS)
+    categories = _persisted_categories(orca_sightings_directory, column)
+    if categories is not None:
+        return categories
+
+    with duckdb.connect() as con:
+        return (
+            con.execute(
+                f"SELECT DISTINCT {col} FROM ({_orca_sightings_source(orca_sightings_directory)}) "
+                f"WHERE {col} IS NOT NULL ORDER BY {col}"
+            )
+            .df()[column]
+            .tolist()
+        )
+
+
+# Preview Rows for Table View
+@st.cache_data
+def query_orca_sighting_preview(orca_sightings_directory, n_rows=25):
+    with duckdb.connect() as con:
+        preview_df = con.execute(
+            f"SELECT * FROM {_parquet_scan(orca_sightings_directory)} LIMIT ?",
+            [n_rows],
+        ).df()
+
+    # Standardize Columns
+    preview_df.columns = preview_df.columns.str.upper()
+    return preview_df
+
+
+# Filter + Aggregate Orca Sightings
+@st.cache_data
+def query_orca_sightings(
+    orca_sightings_directory,
+    x_axis,
+    y_axis,
+    group_cols,
+    agg_func,
+    pod_types,
+    pod_tags,
+    center=None,
+    radius_km=None,
+):
+    """
+    Filter and aggregate orca sightings in a single DuckDB query.
+
+    Parameters:
+        orca_sightings_directory (str): Processed ORCA_SIGHTINGS parquet directory.
+        x_axis (str): X-axis column (always part of the grouping).
+        y_axis (str): Value column to aggregate.
+        group_cols (list): Additional grouping columns.
+        agg_func (str or None): "Mean", "Median", "Sum", "Standard Deviation"
+            or None for unaggregated rows.
+        pod_types (list): Pod types to keep.
+        pod_tags (list): Pod tags to keep.
+        center (tuple, optional): (latitude, longitude) of the spatial filter.
+        radius_km (float, optional): Great-circle radius of the spatial filter.
+
+    Returns:
+        pd.DataFrame: Aggregated rows sorted by the x-axis.
+    """
+    params = {}
+    where = [
+        _isin_filter("POD_TYPE", pod_types, "pod_types", params),
+        _isin_filter("POD_TAG", pod_tags, "pod_tags", params),
+    ]
+
+    # Spatial Filter - haversine distance to center
+    if center is not None and radius_km is not None:
+        where.append(
+            "2 * 6371 * asin(sqrt("
+            'pow(sin(radians("LATITUDE" - $lat) / 2), 2) '
+            '+ cos(radians($lat)) * cos(radians("LATITUDE")) '
+            '* pow(sin(radians("LONGITUDE" - $lon) / 2), 2)'
+            ")) <= $radius_km"
+        )
+        params.update({"lat": center[0], "lon": center[1], "radius_km": radius_km})
+
+    sql, params = _build_aggregation_sql(
+        _orca_sightings_source(orca_sightings_directory),
+        ORCA_SIGHTING_COLUMNS,
+        x_axis,
+        y_axis,
+        group_cols,
+        agg_func,
+        where,
+        params,
+    )
+
+    with duckdb.connect() as con:
+        return con.execute(sql, params).df()
+
+
+#                                                         #
+# ------------------------------------------------------- #
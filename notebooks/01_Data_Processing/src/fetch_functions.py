@@ -0,0 +1,342 @@
+# ----------------------------------------- #
+#                  MODULES                  #
+
+# Standard Modules
+import glob
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Third-Party Modules
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter, Retry
+
+#                                           #
+# ----------------------------------------- #
+
+# ----------------------------------------- #
+#                 FUNCTIONS                 #
+
+
+# Query Session
+def requests_session(retries=3, backoff=0.5, pool_size=16):
+    """Build a requests session with retry logic and a connection pool."""
+    session = requests.Session()
+    retry = Retry(
+        total=retries,
+        read=retries,
+        connect=retries,
+        backoff_factor=backoff,
+        status_forcelist=(500, 502, 503, 504),
+    )
+    adapter = HTTPAdapter(
+        max_retries=retry, pool_connections=pool_size, pool_maxsize=pool_size
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# Download One File (streamed, renamed into place once complete)
+def download_file(
+    url, local_path, session=None, headers=None, timeout=30, overwrite=False
+):
+    if os.path.exists(local_path) and not overwrite:
+        return local_path
+
+    session = session or requests_session()
+    os.makedirs(os.path.dirname(local_path) or ".", exist_ok=True)
+
+    with session.get(url, headers=headers, timeout=timeout, stream=True) as r:
+        r.raise_for_status()
+        with open(f"{local_path}.part", "wb") as f:
+            for chunk in r.iter_content(chunk_size=1 << 16):
+                f.write(chunk)
+    os.replace(f"{local_path}.part", local_path)
+
+    return local_path
+
+
+# Open On-Disk HTTP Cache
+def open_http_cache(cache_dir, max_bytes=2 * 1024**3):
+    """
+    Open a content-addressed on-disk HTTP cache for one refresh run.
+
+    Response bodies are stored once per SHA-256 under `objects/`, and
+    `index.json` maps each URL to its blob and validators (ETag,
+    Last-Modified). Fetch with `fetch_cached` (or `iter_fetch_files(...,
+    cache=cache)`) and end the run with `close_http_cache`.
+
+    Parameters:
+        cache_dir (str): Cache directory.
+        max_bytes (int): Size budget enforced on close (LRU eviction).
+
+    Returns:
+        dict: Cache state (index, lock and per-run hit/miss counters).
+    """
+    os.makedirs(os.path.join(cache_dir, "objects"), exist_ok=True)
+
+    index = {}
+    index_path = os.path.join(cache_dir, "index.json")
+    if os.path.exists(index_path):
+        with open(index_path) as f:
+            index = json.load(f)
+
+    return {
+        "dir": cache_dir,
+        "index": index,
+        "max_bytes": max_bytes,
+        "lock": threading.Lock(),
+        "stats": {"hit": 0, "miss": 0, "unchanged": 0, "bytes_downloaded": 0},
+    }
+
+
+# Cache Blob Path
+def _blob_path(cache, sha256):
+    return os.path.join(cache["dir"], "objects", sha256)
+
+
+# Persist the Cache Index (caller holds the cache lock)
+def _write_cache_index(cache):
+    index_path = os.path.join(cache["dir"], "index.json")
+    with open(f"{index_path}.part", "w") as f:
+        json.dump(cache["index"], f, indent=1)
+    os.replace(f"{index_path}.part", index_path)
+
+
+# Conditional GET Through the Cache
+def fetch_cached(cache, url, session=None, headers=None, timeout=30):
+    """
+    Fetch a URL through the HTTP cache, revalidating cached copies.
+
+    Cached URLs are requested with If-None-Match / If-Modified-Since; a 304
+    is a hit and nothing is downloaded (a 304 without a cached copy raises
+    HTTPError). A 200 is hashed while streaming; if the body matches this
+    URL's previous version it is recorded as unchanged (so parsed results
+    keyed on the blob stay valid), otherwise as a miss. Bodies already
+    stored for another URL are not stored twice. The index is saved after
+    every fetch, so an interrupted run never orphans its blobs.
+
+    Returns:
+        tuple: (blob path, "hit" | "miss" | "unchanged").
+    """
+    session = session or requests_session()
+    headers = dict(headers or {})
+
+    with cache["lock"]:
+        entry = cache["index"].get(url)
+    previous_sha256 = None if entry is None else entry["sha256"]
+
+    if entry is not None and os.path.exists(_blob_path(cache, entry["sha256"])):
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+    else:
+        entry = None
+
+    with session.get(url, headers=headers, timeout=timeout, stream=True) as r:
+        if r.status_code == 304:
+            if entry is None:
+                raise requests.HTTPError(
+                    f"304 Not Modified without a cached copy for url: {url}",
+                    response=r,
+                )
+            status = "hit"
+        else:
+            r.raise_for_status()
+
+            # Stream to a temporary file, hashing as bytes arrive
+            digest = hashlib.sha256()
+            size = 0
+            fd, tmp_path = tempfile.mkstemp(dir=cache["dir"], suffix=".part")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    for chunk in r.iter_content(chunk_size=1 << 16):
+                        digest.update(chunk)
+                        f.write(chunk)
+                        size += len(chunk)
+
+                blob_path = _blob_path(cache, digest.hexdigest())
+                if os.path.exists(blob_path):
+                    os.remove(tmp_path)
+                else:
+                    os.replace(tmp_path, blob_path)
+                if digest.hexdigest() == previous_sha256:
+                    status = "unchanged"
+                else:
+                    status = "miss"
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+
+            entry = {
+                "sha256": digest.hexdigest(),
+                "size": size,
+                "etag": r.headers.get("ETag"),
+                "last_modified": r.headers.get("Last-Modified"),
+            }
+
+    with cache["lock"]:
+        entry = dict(entry, last_access=time.time())
+        cache["index"][url] = entry
+        cache["stats"][status] += 1
+        if status != "hit":
+            cache["stats"]["bytes_downloaded"] += entry["size"]
+        _write_cache_index(cache)
+
+    return _blob_path(cache, entry["sha256"]), status
+
+
+# Parse a Cached Blob Once (result stored next to the blob)
+def parse_cached(blob_path, parse_fn=pd.read_csv, suffix="csv"):
+    parsed_path = f"{blob_path}.{suffix}.pkl"
+    if os.path.exists(parsed_path):
+        return pd.read_pickle(parsed_path)
+
+    # Unique temporary file - URLs with identical bodies share a blob and
+    # can be parsed concurrently
+    result = parse_fn(blob_path)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(blob_path), suffix=".part")
+    os.close(fd)
+    try:
+        result.to_pickle(tmp_path)
+        os.replace(tmp_path, parsed_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return result
+
+
+# Close HTTP Cache - Evict, Persist Index and Report
+def close_http_cache(cache, verbose=True):
+    """
+    Evict least recently used blobs above the size budget, persist the
+    index and report this run's hits/misses.
+
+    Returns:
+        dict: hit, miss, unchanged, bytes_downloaded, evicted, cache_bytes.
+    """
+    objects_dir = os.path.join(cache["dir"], "objects")
+
+    with cache["lock"]:
+        index = cache["index"]
+
+        # Blob size + last access (a blob can back several URLs)
+        blobs = {}
+        for entry in index.values():
+            _, last_access = blobs.get(entry["sha256"], (0, 0))
+            blobs[entry["sha256"]] = (
+                entry["size"],
+                max(last_access, entry["last_access"]),
+            )
+
+        # Evict Least Recently Used
+        cache_bytes = sum(size for size, _ in blobs.values())
+        evicted = set()
+        for sha256, (size, _) in sorted(blobs.items(), key=lambda b: b[1][1]):
+            if cache_bytes <= cache["max_bytes"]:
+                break
+            evicted.add(sha256)
+            cache_bytes -= size
+
+        for url in [url for url, e in index.items() if e["sha256"] in evicted]:
+            del index[url]
+
+        # Remove blobs (and parsed results) no longer referenced
+        referenced = {entry["sha256"] for entry in index.values()}
+        for path in glob.glob(os.path.join(objects_dir, "*")):
+            if os.path.basename(path).split(".")[0] not in referenced:
+                os.remove(path)
+
+        _write_cache_index(cache)
+
+        report = dict(cache["stats"], evicted=len(evicted), cache_bytes=cache_bytes)
+
+    if verbose:
+        print(
+            f"🗄️  HTTP cache: {report['hit']} hit(s), {report['miss']} miss(es), "
+            f"{report['unchanged']} unchanged, "
+            f"{report['bytes_downloaded'] / 1e6:.1f} MB downloaded, "
+            f"{report['evicted']} evicted ({cache_bytes / 1e6:.1f} MB cached)"
+        )
+
+    return report
+
+
+# Concurrent Download + Parse (completion order)
+def iter_fetch_files(
+    files,
+    parse_fn=None,
+    max_workers=8,
+    session=None,
+    headers=None,
+    timeout=30,
+    overwrite=False,
+    cache=None,
+):
+    """
+    Download files with bounded concurrency over one pooled session.
+
+    Each worker thread downloads its file and then runs `parse_fn` on the
+    local path, so parsing overlaps with the remaining downloads. Files that
+    already exist locally are not downloaded again (unless `overwrite`).
+
+    Parameters:
+        files (list): (url, local_path) pairs.
+        parse_fn (callable, optional): Applied to each local path in the worker.
+        max_workers (int): Maximum concurrent downloads.
+        session (requests.Session, optional): Shared session (pool sized to
+            `max_workers` if not given).
+        headers (dict, optional): Extra request headers (e.g. auth token).
+        timeout (int): Per-request timeout in seconds.
+        overwrite (bool): Re-download files that exist locally.
+        cache (dict, optional): HTTP cache from `open_http_cache`; files are
+            then fetched conditionally into the cache (local paths unused)
+            and `parse_fn` receives the blob path.
+
+    Yields:
+        tuple: (index into `files`, parsed result or local path), in
+        completion order. Failed files yield None and print the error.
+    """
+    session = session or requests_session(pool_size=max_workers)
+
+    def _fetch_one(url, local_path):
+        if cache is not None:
+            local_path, _ = fetch_cached(cache, url, session, headers, timeout)
+        else:
+            download_file(url, local_path, session, headers, timeout, overwrite)
+        return parse_fn(local_path) if parse_fn else local_path
+
+    with ThreadPoolExecutor(max_workers=max(int(max_workers), 1)) as ex:
+        futures = {
+            ex.submit(_fetch_one, url, local_path): i
+            for i, (url, local_path) in enumerate(files)
+        }
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                yield i, future.result()
+            except Exception as e:
+                print(f"❌ Error fetching {files[i][0]}: {e}")
+                yield i, None
+
+
+# Concurrent Download + Parse (input order)
+def fetch_files(files, parse_fn=None, max_workers=8, **kwargs):
+    """Like `iter_fetch_files`, but returns all results in the order of `files`."""
+    results = [None] * len(files)
+    for i, result in iter_fetch_files(files, parse_fn, max_workers, **kwargs):
+        results[i] = result
+    return results
+
+
+#                                           #
+# ----------------------------------------- #
@@ -0,0 +1,399 @@
+# ----------------------------------------- #
+#                  MODULES                  #
+
+# Standard Modules
+import hashlib
+import os
+
+# Third-Party Modules
+import h3
+import numpy as np
+import pandas as pd
+import rasterio.features
+from rasterio.windows import Window, bounds as window_bounds
+from rasterio.windows import transform as window_transform
+from shapely.geometry import box
+
+#                                           #
+# ----------------------------------------- #
+
+# ----------------------------------------- #
+#                 FUNCTIONS                 #
+
+
+# Row/Column Windows Over a Raster (dask chunks if present, else fixed tiles)
+def _raster_windows(da, window_size):
+    if da.chunks is not None:
+        y_sizes = da.chunks[da.get_axis_num("y")]
+        x_sizes = da.chunks[da.get_axis_num("x")]
+    else:
+        height, width = da.sizes["y"], da.sizes["x"]
+        y_sizes = [min(window_size, height - i) for i in range(0, height, window_size)]
+        x_sizes = [min(window_size, width - j) for j in range(0, width, window_size)]
+
+    y_offsets = np.cumsum([0, *y_sizes[:-1]])
+    x_offsets = np.cumsum([0, *x_sizes[:-1]])
+    for row_off, height in zip(y_offsets, y_sizes):
+        for col_off, width in zip(x_offsets, x_sizes):
+            yield Window(int(col_off), int(row_off), int(width), int(height))
+
+
+# Single-Band (y, x) View of a Raster
+def _single_band(da):
+    if "band" in da.dims:
+        if da.sizes["band"] != 1:
+            raise ValueError("Input DataArray must have a single band")
+        da = da.squeeze("band", drop=True)
+    return da
+
+
+# Pixel -> Polygon Index for a Raster Grid (built window by window)
+def build_pixel_index(gdf, da, window_size=2048):
+    """
+    Assign raster pixels to the polygons that cover them.
+
+    Polygons are rasterized one window at a time on the raster's grid
+    (all_touched; later polygons win overlaps), and only the polygons
+    overlapping each window are burned in.
+
+    Parameters:
+        gdf (gpd.GeoDataFrame): Polygons (in the raster CRS).
+        da (xr.DataArray): Raster defining the grid (rio transform); only
+            its shape and transform are used.
+        window_size (int): Tile size (pixels) when `da` is not chunked.
+
+    Returns:
+        pd.DataFrame: PIXEL (flat row-major pixel index) and CELL_CODE
+        (position of the polygon in gdf), sorted by PIXEL.
+    """
+    da = _single_band(da)
+    transform = da.rio.transform()
+    width = da.sizes["x"]
+    geometries = gdf.geometry.to_numpy()
+    sindex = gdf.sindex
+
+    pixels, codes = [], []
+    for window in _raster_windows(da, window_size):
+        # Polygons overlapping the window (in input order, so later ones win)
+        overlapping = np.sort(
+            sindex.query(box(*window_bounds(window, transform)), predicate="intersects")
+        )
+        if len(overlapping) == 0:
+            continue
+
+        mask = rasterio.features.rasterize(
+            ((geometries[i], j) for j, i in enumerate(overlapping)),
+            out_shape=(window.height, window.width),
+            transform=window_transform(window, transform),
+            fill=-1,  # Mark areas outside polygons
+            all_touched=True,
+            dtype=np.int32,
+        )
+        rows, cols = np.nonzero(mask >= 0)
+        pixels.append((rows + window.row_off) * width + cols + window.col_off)
+        codes.append(overlapping[mask[rows, cols]].astype(np.int32))
+
+    pixel_index = pd.DataFrame(
+        {
+            "PIXEL": np.concatenate([np.array([], dtype=np.int64), *pixels]),
+            "CELL_CODE": np.concatenate([np.array([], dtype=np.int32), *codes]),
+        }
+    )
+    return pixel_index.sort_values("PIXEL", ignore_index=True)
+
+
+# Persisted Pixel -> H3 Cell Index for a Raster Grid
+def load_pixel_index(gdf, da, cache_dir="cache", id_col="h3_index", window_size=2048):
+    """
+    Load the pixel -> cell index for a raster grid, building and caching it
+    if needed.
+
+    The file is keyed by the grid definition (CRS, transform, shape) and the
+    cells (ids + geometries), e.g. `PIXEL_INDEX_R6_<hash>.parquet`, so every
+    raster on the same grid (bathymetry, SST, ...) reuses one index.
+
+    Parameters:
+        gdf (gpd.GeoDataFrame): H3 cell polygons with unique `id_col` values.
+        da (xr.DataArray): Raster defining the grid.
+        cache_dir (str): Directory for the index files.
+        id_col (str): Cell id column (H3 index).
+        window_size (int): Tile size used to build the index.
+
+    Returns:
+        pd.DataFrame: PIXEL and CELL (categorical of `id_col`, one category
+        per polygon), sorted by PIXEL.
+    """
+    if gdf[id_col].duplicated().any():
+        raise ValueError(f"{id_col} values must be unique.")
+    if da.rio.crs != gdf.crs:
+        gdf = gdf.to_crs(da.rio.crs)
+    gdf = gdf.reset_index(drop=True)
+
+    # Grid + Cells Signature
+    grid = _single_band(da)
+    signature = hashlib.sha1()
+    signature.update(str(grid.rio.crs).encode())
+    signature.update(str(tuple(grid.rio.transform())).encode())
+    signature.update(str((grid.sizes["y"], grid.sizes["x"])).encode())
+    signature.update("\n".join(gdf[id_col].astype(str)).encode())
+    signature.update(b"".join(gdf.geometry.to_wkb()))
+
+    resolution = h3.get_resolution(gdf[id_col].iloc[0])
+    index_path = os.path.join(
+        cache_dir, f"PIXEL_INDEX_R{resolution}_{signature.hexdigest()[:16]}.parquet"
+    )
+
+    if os.path.exists(index_path):
+        return pd.read_parquet(index_path)
+
+    pixel_index = build_pixel_index(gdf, grid, window_size=window_size)
+    pixel_index = pd.DataFrame(
+        {
+            "PIXEL": pixel_index["PIXEL"],
+            "CELL": pd.Categorical.from_codes(
+                pixel_index["CELL_CODE"], categories=gdf[id_col]
+            ),
+        }
+    )
+
+    os.makedirs(cache_dir, exist_ok=True)
+    pixel_index.to_parquet(f"{index_path}.part")
+    os.replace(f"{index_path}.part", index_path)
+
+    return pixel_index
+
+
+# Empty Running Stats for `n` Keys
+def _new_stats_state(n):
+    return {
+        "count": np.zeros(n, dtype=np.int64),
+        "sum": np.zeros(n),
+        "mean": np.zeros(n),
+        "m2": np.zeros(n),
+        "min": np.full(n, np.inf),
+        "max": np.full(n, -np.inf),
+        "sketch": [],
+    }
+
+
+# Merge Sketch Parts (sum counts of equal (key, value) pairs)
+def _compact_sketch(sketches):
+    return (
+        pd.concat(sketches, ignore_index=True)
+        .groupby(["id", "q"], sort=True)["count"]
+        .sum()
+        .reset_index()
+    )
+
+
+# Partial Stats of One Block, Merged Into the Running State
+def _merge_block_stats(state, ids, values, median_step):
+    n_keys = len(state["count"])
+    count = np.bincount(ids, minlength=n_keys)
+    seen = count > 0
+
+    # Block-local mean / sum of squared deviations (merged with Chan et al.)
+    total = np.bincount(ids, weights=values, minlength=n_keys)
+    mean_b = np.divide(total, count, out=np.zeros(n_keys), where=seen)
+    m2_b = np.bincount(ids, weights=(values - mean_b[ids]) ** 2, minlength=n_keys)
+
+    n_old = state["count"]
+    n_new = n_old + count
+    delta = mean_b - state["mean"]
+    ratio = np.divide(count, n_new, out=np.zeros(n_keys), where=seen)
+    state["mean"] += delta * ratio
+    state["m2"] += m2_b + delta**2 * n_old * ratio
+    state["count"] = n_new
+    state["sum"] += total
+
+    np.minimum.at(state["min"], ids, values)
+    np.maximum.at(state["max"], ids, values)
+
+    # Median sketch: (key, quantized value) -> pixel count
+    keys = pd.DataFrame({"id": ids, "q": np.round(values / median_step)})
+    state["sketch"].append(keys.value_counts(sort=False).reset_index())
+    if len(state["sketch"]) >= 64:
+        state["sketch"] = [_compact_sketch(state["sketch"])]
+
+
+# Medians From the Merged (key, quantized value) Counts
+def _sketch_medians(sketches, n_keys, median_step):
+    medians = np.full(n_keys, np.nan)
+    if not sketches:
+        return medians
+
+    merged = _compact_sketch(sketches)
+    ids = merged["id"].to_numpy()
+    values = merged["q"].to_numpy() * median_step
+    cum = np.cumsum(merged["count"].to_numpy())
+
+    # Per key: offset of its first pair in the global cumulative count
+    key_ids, starts = np.unique(ids, return_index=True)
+    base = np.where(starts > 0, cum[starts - 1], 0)
+    n = cum[np.r_[starts[1:], len(cum)] - 1] - base
+
+    # Middle ranks (0-based) -> values, averaged as np.median
+    lower = values[np.searchsorted(cum, base + (n - 1) // 2, side="right")]
+    upper = values[np.searchsorted(cum, base + n // 2, side="right")]
+    medians[key_ids] = (lower + upper) / 2
+    return medians
+
+
+# Final Stats per Key (NaN for keys without valid pixels)
+def _finalize_stats(state, median_step):
+    has_pixels = state["count"] > 0
+    count = np.where(has_pixels, state["count"], 1)
+    return {
+        "count": state["count"],
+        "min": np.where(has_pixels, state["min"], np.nan),
+        "max": np.where(has_pixels, state["max"], np.nan),
+        "mean": np.where(has_pixels, state["sum"] / count, np.nan),
+        "median": _sketch_medians(state["sketch"], len(count), median_step),
+        "std": np.where(has_pixels, np.sqrt(state["m2"] / count), np.nan),
+    }
+
+
+# Zonal Statistics From a Pixel Index (single rasters or time stacks)
+def zonal_stats_indexed(
+    da, pixel_index, time_dim=None, time_chunk=31, band_rows=2048, median_step=0.01
+):
+    """
+    Reduce a raster (or a stack of rasters) to per-cell statistics using a
+    pixel index from `load_pixel_index`/`build_pixel_index`.
+
+    The raster is streamed in blocks of `time_chunk` steps x `band_rows` rows
+    (cropped to the columns the index uses; blocks without indexed pixels are
+    never read). Each block is reduced with `bincount`s on (step, cell) keys
+    and merged into running count, sum, min, max, mean + sum of squared
+    deviations, and a mergeable median sketch (counts per value rounded to
+    `median_step`; exact for integer rasters).
+
+    Parameters:
+        da (xr.DataArray): Raster on the index's grid, dims (y, x) or
+            (time_dim, y, x) (a single band dim is dropped).
+        pixel_index (pd.DataFrame): PIXEL + CELL (categorical) or CELL_CODE.
+        time_dim (str, optional): Time dimension of a stack (e.g. "time").
+        time_chunk (int): Time steps per block.
+        band_rows (int): Raster rows per block.
+        median_step (float): Value resolution of the median sketch.
+
+    Returns:
+        pd.DataFrame: CELL, [time_dim,] count, min, max, mean, median, std -
+        one row per cell (and step) with at least one valid pixel.
+    """
+    da = _single_band(da)
+    if time_dim is None:
+        da = da.expand_dims("_step")
+        time_dim = "_step"
+    da = da.transpose(time_dim, "y", "x")
+
+    if "CELL" in pixel_index:
+        cell_codes = pixel_index["CELL"].cat.codes.to_numpy()
+        cells = pixel_index["CELL"].cat.categories
+    else:
+        cell_codes = pixel_index["CELL_CODE"].to_numpy()
+        cells = pd.RangeIndex(cell_codes.max(initial=-1) + 1)
+    cell_codes = cell_codes.astype(np.int64)
+    n_cells = len(cells)
+
+    pixels = pixel_index["PIXEL"].to_numpy()
+    width = da.sizes["x"]
+    rows, cols = pixels // width, pixels % width
+
+    # Row bands -> contiguous slices of the (PIXEL-sorted) index
+    band_edges = np.arange(0, da.sizes["y"] + band_rows, band_rows)
+    band_slices = np.searchsorted(rows, band_edges)
+
+    tables = []
+    n_steps = da.sizes[time_dim]
+    for t0 in range(0, n_steps, time_chunk):
+        n_t = min(time_chunk, n_steps - t0)
+        state = _new_stats_state(n_t * n_cells)
+
+        for b in range(len(band_edges) - 1):
+            lo, hi = band_slices[b], band_slices[b + 1]
+            if lo == hi:
+                continue
+
+            # Read only the indexed columns of this band
+            row0 = band_edges[b]
+            col0, col1 = cols[lo:hi].min(), cols[lo:hi].max() + 1
+            block = da.isel(
+                {
+                    time_dim: slice(t0, t0 + n_t),
+                    "y": slice(row0, min(band_edges[b + 1], da.sizes["y"])),
+                    "x": slice(col0, col1),
+                }
+            ).values
+            block = block.reshape(n_t, -1)
+
+            local = (rows[lo:hi] - row0) * (col1 - col0) + cols[lo:hi] - col0
+            values = block[:, local].astype(np.float64).ravel()
+            keys = (np.arange(n_t)[:, None] * n_cells + cell_codes[lo:hi]).ravel()
+
+            # Valid pixels (exclude nodata)
+            valid = np.isfinite(values)
+            if valid.any():
+                _merge_block_stats(state, keys[valid], values[valid], median_step)
+
+        stats = pd.DataFrame(_finalize_stats(state, median_step))
+        stats.insert(0, "CELL", np.tile(cells, n_t))
+        stats.insert(
+            1, time_dim, np.repeat(da[time_dim].values[t0 : t0 + n_t], n_cells)
+        )
+        tables.append(stats[stats["count"] > 0])
+
+    table = pd.concat(tables, ignore_index=True)
+    if time_dim == "_step":
+        table = table.drop(columns="_step")
+    return table
+
+
+# Windowed (Out-of-Core) Zonal Statistics
+def polygon_stats_windowed(da, gdf, window_size=2048, median_step=0.01):
+    """
+    Compute min, max, mean, median and std of a raster within each polygon,
+    reading the raster one window at a time.
+
+    Polygons are rasterized window by window into an in-memory pixel index
+    (`build_pixel_index`) and the raster is reduced band by band with
+    `zonal_stats_indexed`. Use `load_pixel_index` instead to persist the
+    index and reuse it across rasters on the same grid.
+
+    Parameters:
+        da (xr.DataArray): Single-band raster with rio CRS/transform.
+        gdf (gpd.GeoDataFrame): Polygon geometries.
+        window_size (int): Tile size / band height (pixels).
+        median_step (float): Value resolution of the median sketch.
+
+    Returns:
+        gpd.GeoDataFrame: Input GeoDataFrame with added columns for min, max,
+        mean, median, and std.
+    """
+    # Validate inputs
+    if not hasattr(da, "rio") or da.rio.crs is None:
+        raise ValueError("Input DataArray must have a valid CRS")
+    if gdf.crs is None:
+        raise ValueError("Input GeoDataFrame must have a valid CRS")
+    if not all(gdf.geometry.is_valid):
+        raise ValueError("GeoDataFrame contains invalid geometries")
+
+    # Ensure CRS match
+    if da.rio.crs != gdf.crs:
+        gdf = gdf.to_crs(da.rio.crs)
+    gdf = gdf.reset_index(drop=True)
+
+    pixel_index = build_pixel_index(gdf, da, window_size=window_size)
+    stats = zonal_stats_indexed(
+        da, pixel_index, band_rows=window_size, median_step=median_step
+    )
+    if stats.empty:
+        raise ValueError("No valid pixels found in the raster for any polygon")
+
+    # Join stats to GeoDataFrame
+    stats_df = stats.set_index("CELL").reindex(range(len(gdf)))
+    return gdf.join(stats_df[["min", "max", "mean", "median", "std"]])
+
+
+#                                           #
+# ----------------------------------------- #
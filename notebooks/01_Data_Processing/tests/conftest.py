@@ -0,0 +1,12 @@
+# ----------------------------------------- #
+#                  MODULES                  #
+
+# Standard Modules
+import os
+import sys
+
+# Built Modules (notebook-style `from src.X import ...`)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+#                                           #
+# ----------------------------------------- #
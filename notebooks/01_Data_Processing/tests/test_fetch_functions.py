@@ -0,0 +1,307 @@
+# ----------------------------------------- #
+#                  MODULES                  #
+
+# Standard Modules
+import hashlib
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Third-Party Modules
+import pandas as pd
+import pytest
+import requests
+
+# Built Modules
+from src.fetch_functions import (
+    close_http_cache,
+    download_file,
+    fetch_cached,
+    fetch_files,
+    iter_fetch_files,
+    open_http_cache,
+    parse_cached,
+)
+
+#                                           #
+# ----------------------------------------- #
+
+# ----------------------------------------- #
+#                 FIXTURES                  #
+
+
+# Local HTTP Stand-In Server
+class _Handler(BaseHTTPRequestHandler):
+    """
+    Serves `server.files` (path -> body bytes) with an ETag per body.
+
+    Special paths: /truncated/* announces more bytes than it sends, and
+    /slow/* sleeps before answering (to observe concurrent requests).
+    """
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append((self.path, dict(self.headers)))
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        try:
+            self._respond()
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def _respond(self):
+        server = self.server
+        if self.path.startswith("/slow/"):
+            time.sleep(0.2)
+
+        body = server.files.get(self.path)
+        if body is None:
+            self.send_error(404)
+            return
+
+        etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+        if server.etags and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        if server.etags:
+            self.send_header("ETag", etag)
+        if self.path.startswith("/truncated/"):
+            self.send_header("Content-Length", str(len(body) * 2))
+            self.end_headers()
+            self.wfile.write(body)
+            self.close_connection = True
+            return
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def http_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.daemon_threads = True
+    server.files = {}
+    server.etags = True
+    server.requests = []
+    server.lock = threading.Lock()
+    server.active = 0
+    server.max_active = 0
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+# CSV Body With a Distinct Value
+def _csv(i):
+    return f"A,B\n{i},{i * 2}\n".encode()
+
+
+#                                           #
+# ----------------------------------------- #
+
+# ----------------------------------------- #
+#                   TESTS                   #
+
+
+# Downloads Run Concurrently and Parse in the Workers (input order kept)
+def test_fetch_files_downloads_and_parses_concurrently(http_server, tmp_path):
+    files = []
+    for i in range(8):
+        http_server.files[f"/slow/{i}.csv"] = _csv(i)
+        files.append((f"{http_server.url}/slow/{i}.csv", str(tmp_path / f"{i}.csv")))
+
+    results = fetch_files(files, parse_fn=pd.read_csv, max_workers=4)
+
+    assert [int(df["A"].iloc[0]) for df in results] == list(range(8))
+    assert http_server.max_active > 1
+    assert sorted(os.listdir(tmp_path)) == sorted(f"{i}.csv" for i in range(8))
+
+
+# Completion-Order Iterator Covers Every File Once
+def test_iter_fetch_files_yields_every_index(http_server, tmp_path):
+    files = []
+    for i in range(5):
+        http_server.files[f"/{i}.csv"] = _csv(i)
+        files.append((f"{http_server.url}/{i}.csv", str(tmp_path / f"{i}.csv")))
+
+    indices = [i for i, path in iter_fetch_files(files, max_workers=3)]
+
+    assert sorted(indices) == list(range(5))
+
+
+# Completed Downloads Are Renamed Into Place; Existing Files Are Skipped
+def test_download_file_renames_part_file(http_server, tmp_path):
+    http_server.files["/data.csv"] = _csv(1)
+    local_path = str(tmp_path / "sub" / "data.csv")
+
+    assert download_file(f"{http_server.url}/data.csv", local_path) == local_path
+    with open(local_path, "rb") as f:
+        assert f.read() == _csv(1)
+    assert not os.path.exists(f"{local_path}.part")
+
+    # Not downloaded again unless overwrite
+    http_server.files["/data.csv"] = _csv(2)
+    download_file(f"{http_server.url}/data.csv", local_path)
+    with open(local_path, "rb") as f:
+        assert f.read() == _csv(1)
+    download_file(f"{http_server.url}/data.csv", local_path, overwrite=True)
+    with open(local_path, "rb") as f:
+        assert f.read() == _csv(2)
+
+
+# Interrupted Downloads Never Appear Under the Final Name
+def test_download_file_truncated_body_leaves_no_file(http_server, tmp_path):
+    http_server.files["/truncated/data.csv"] = _csv(1)
+    local_path = str(tmp_path / "data.csv")
+
+    with pytest.raises(requests.exceptions.RequestException):
+        download_file(f"{http_server.url}/truncated/data.csv", local_path)
+    assert not os.path.exists(local_path)
+
+
+# HTTP Errors Raise From download_file ...
+def test_download_file_raises_http_errors(http_server, tmp_path):
+    with pytest.raises(requests.HTTPError):
+        download_file(f"{http_server.url}/missing.csv", str(tmp_path / "x.csv"))
+    assert not os.path.exists(tmp_path / "x.csv")
+
+
+# ... and Yield None (with a message) From the Concurrent Fetchers
+def test_fetch_files_reports_failures(http_server, tmp_path, capsys):
+    http_server.files["/ok.csv"] = _csv(1)
+    files = [
+        (f"{http_server.url}/ok.csv", str(tmp_path / "ok.csv")),
+        (f"{http_server.url}/missing.csv", str(tmp_path / "missing.csv")),
+    ]
+
+    results = fetch_files(files, parse_fn=pd.read_csv, max_workers=2)
+
+    assert int(results[0]["A"].iloc[0]) == 1
+    assert results[1] is None
+    assert "missing.csv" in capsys.readouterr().out
+
+
+# Parse Errors Propagate the Same Way
+def test_fetch_files_reports_parse_errors(http_server, tmp_path, capsys):
+    http_server.files["/ok.csv"] = _csv(1)
+
+    def _fail(path):
+        raise ValueError("bad file")
+
+    results = fetch_files(
+        [(f"{http_server.url}/ok.csv", str(tmp_path / "ok.csv"))], parse_fn=_fail
+    )
+
+    assert results == [None]
+    assert "bad file" in capsys.readouterr().out
+
+
+# Conditional Requests: 200 (miss), 304 (hit), changed body (miss)
+def test_fetch_cached_revalidates(http_server, tmp_path):
+    cache = open_http_cache(str(tmp_path / "cache"))
+    url = f"{http_server.url}/data.csv"
+    http_server.files["/data.csv"] = _csv(1)
+
+    blob_path, status = fetch_cached(cache, url)
+    assert status == "miss"
+    with open(blob_path, "rb") as f:
+        assert f.read() == _csv(1)
+
+    assert fetch_cached(cache, url) == (blob_path, "hit")
+    assert "If-None-Match" in http_server.requests[-1][1]
+
+    http_server.files["/data.csv"] = _csv(2)
+    new_blob_path, status = fetch_cached(cache, url)
+    assert status == "miss" and new_blob_path != blob_path
+
+    report = close_http_cache(cache, verbose=False)
+    assert (report["hit"], report["miss"], report["unchanged"]) == (1, 2, 0)
+
+    # Index persisted: a new run revalidates instead of downloading
+    cache = open_http_cache(str(tmp_path / "cache"))
+    assert fetch_cached(cache, url) == (new_blob_path, "hit")
+
+
+# A 304 Without a Cached Copy Is an Error (nothing cached)
+def test_fetch_cached_304_without_entry_raises(http_server, tmp_path):
+    cache = open_http_cache(str(tmp_path / "cache"))
+    url = f"{http_server.url}/data.csv"
+    http_server.files["/data.csv"] = _csv(1)
+    etag = f'"{hashlib.sha256(_csv(1)).hexdigest()[:16]}"'
+
+    with pytest.raises(requests.HTTPError):
+        fetch_cached(cache, url, headers={"If-None-Match": etag})
+    assert url not in cache["index"]
+    assert cache["stats"]["miss"] == 0
+
+    # Same once the cached blob is gone
+    blob_path, _ = fetch_cached(cache, url)
+    os.remove(blob_path)
+    with pytest.raises(requests.HTTPError):
+        fetch_cached(cache, url, headers={"If-None-Match": etag})
+
+
+# Interrupted Run (no close): the next run keeps its blobs
+def test_fetch_cached_persists_index_without_close(http_server, tmp_path):
+    cache = open_http_cache(str(tmp_path / "cache"))
+    url = f"{http_server.url}/data.csv"
+    http_server.files["/data.csv"] = _csv(1)
+    blob_path, _ = fetch_cached(cache, url)
+
+    cache = open_http_cache(str(tmp_path / "cache"))
+    close_http_cache(cache, verbose=False)
+
+    assert os.path.exists(blob_path)
+    cache = open_http_cache(str(tmp_path / "cache"))
+    assert fetch_cached(cache, url) == (blob_path, "hit")
+
+
+# Same Body Re-Sent (no validators): unchanged, parsed result reused
+def test_fetch_cached_unchanged_body(http_server, tmp_path):
+    http_server.etags = False
+    cache = open_http_cache(str(tmp_path / "cache"))
+    url = f"{http_server.url}/data.csv"
+    http_server.files["/data.csv"] = _csv(1)
+
+    blob_path, status = fetch_cached(cache, url)
+    assert status == "miss"
+    parsed = parse_cached(blob_path)
+
+    assert fetch_cached(cache, url) == (blob_path, "unchanged")
+    pd.testing.assert_frame_equal(parse_cached(blob_path), parsed)
+
+
+# Duplicate Bodies on a Cold Cache: one blob, every URL a miss, no races
+def test_fetch_files_duplicate_bodies(http_server, tmp_path):
+    cache = open_http_cache(str(tmp_path / "cache"))
+    files = []
+    for i in range(20):
+        http_server.files[f"/{i}.csv"] = _csv(0)
+        files.append((f"{http_server.url}/{i}.csv", None))
+
+    results = fetch_files(files, parse_fn=parse_cached, max_workers=8, cache=cache)
+
+    assert all(df is not None and int(df["A"].iloc[0]) == 0 for df in results)
+    report = close_http_cache(cache, verbose=False)
+    assert (report["miss"], report["unchanged"], report["hit"]) == (20, 0, 0)
+
+    sha256 = hashlib.sha256(_csv(0)).hexdigest()
+    objects = sorted(os.listdir(tmp_path / "cache" / "objects"))
+    assert objects == [sha256, f"{sha256}.csv.pkl"]
+
+
+#                                           #
+# ----------------------------------------- #
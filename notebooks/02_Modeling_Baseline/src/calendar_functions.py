@@ -0,0 +1,168 @@
+# ----------------------------------------- #
+#                  MODULES                  #
+
+# Standard Modules
+import os
+
+# Third-Party Modules
+import numpy as np
+import pandas as pd
+
+#                                           #
+# ----------------------------------------- #
+
+# ----------------------------------------- #
+#                PARAMETERS                 #
+
+# Per-Day Calendar Features (gathered into model frames by day index)
+CALENDAR_FEATURES = [
+    "DOY",
+    "DOW",
+    "WOY",
+    "MONTH",
+    "YEAR",
+    "MONTH_SIN",
+    "MONTH_COS",
+    "DOY_SIN",
+    "DOY_COS",
+    "WOY_SIN",
+    "WOY_COS",
+]
+
+#                                           #
+# ----------------------------------------- #
+
+# ----------------------------------------- #
+#                 FUNCTIONS                 #
+
+
+# Build Calendar Dimension (one row per day)
+def build_calendar(start_date, end_date):
+    """
+    Build a calendar dimension table with one row per day.
+
+    Row i is day `start_date + i`, so model frames gather their temporal
+    features by integer day offset instead of recomputing them per row.
+
+    Parameters:
+        start_date (str or datetime): First day of the calendar.
+        end_date (str or datetime): Last day of the calendar.
+
+    Returns:
+        pd.DataFrame: DATE, YEAR_WEEK and CALENDAR_FEATURES.
+    """
+    dates = pd.Series(
+        pd.date_range(
+            start=pd.Timestamp(start_date).normalize(),
+            end=pd.Timestamp(end_date).normalize(),
+            freq="D",
+        )
+    )
+    calendar = pd.DataFrame({"DATE": dates})
+
+    # Temporal Features
+    calendar["DOY"] = dates.dt.day_of_year
+    calendar["DOW"] = dates.dt.day_of_week
+    calendar["WOY"] = dates.dt.isocalendar().week
+    calendar["MONTH"] = dates.dt.month
+    calendar["YEAR"] = dates.dt.year
+    calendar["YEAR_WEEK"] = dates.dt.strftime("%Y-%U")
+
+    calendar["MONTH_SIN"] = np.sin(2 * np.pi * calendar["MONTH"] / 12)
+    calendar["MONTH_COS"] = np.cos(2 * np.pi * calendar["MONTH"] / 12)
+
+    calendar["DOY_SIN"] = np.sin(2 * np.pi * calendar["MONTH"] / 12)
+    calendar["DOY_COS"] = np.cos(2 * np.pi * calendar["MONTH"] / 12)
+
+    calendar["WOY_SIN"] = np.sin(2 * np.pi * calendar["WOY"] / 52)
+    calendar["WOY_COS"] = np.cos(2 * np.pi * calendar["WOY"] / 52)
+
+    return calendar
+
+
+# Load Calendar From Disk (built and cached on first use)
+def load_calendar(start_date, end_date, cache_dir="cache"):
+    """
+    Load the calendar for a date span, building and caching it if needed.
+
+    The table is stored as `CALENDAR_<start>_<end>.parquet` in `cache_dir`;
+    a cached file with different columns (older feature set) is rebuilt.
+    """
+    start_date = pd.Timestamp(start_date).normalize()
+    end_date = pd.Timestamp(end_date).normalize()
+    calendar_path = os.path.join(
+        cache_dir, f"CALENDAR_{start_date:%Y%m%d}_{end_date:%Y%m%d}.parquet"
+    )
+
+    if os.path.exists(calendar_path):
+        calendar = pd.read_parquet(calendar_path)
+        if set(calendar.columns) == {"DATE", "YEAR_WEEK", *CALENDAR_FEATURES}:
+            return calendar
+
+    calendar = build_calendar(start_date, end_date)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    calendar.to_parquet(f"{calendar_path}.part")
+    os.replace(f"{calendar_path}.part", calendar_path)
+
+    return calendar
+
+
+# Integer Day Offsets Into the Calendar
+def calendar_day_index(calendar, dates):
+    days = np.asarray(dates, dtype="datetime64[ns]").astype("datetime64[D]")
+    start = np.datetime64(calendar["DATE"].iloc[0], "D")
+    day_index = (days - start).astype(np.int64)
+
+    if len(day_index) and (day_index.min() < 0 or day_index.max() >= len(calendar)):
+        raise ValueError("Dates fall outside the calendar span.")
+
+    return day_index
+
+
+# Gather Calendar Features Into a Frame
+def add_calendar_features(
+    data, calendar=None, date_col="DATE", columns=CALENDAR_FEATURES
+):
+    """
+    Add calendar features to `data` by gathering rows of the calendar.
+
+    Parameters:
+        data (pd.DataFrame): Frame with a daily date column.
+        calendar (pd.DataFrame, optional): From `build_calendar`/`load_calendar`
+            (built for the span of `data` if not given).
+        date_col (str): Date column name.
+        columns (list): Calendar columns to add.
+
+    Returns:
+        pd.DataFrame: `data` with the calendar columns.
+    """
+    if calendar is None:
+        calendar = build_calendar(data[date_col].min(), data[date_col].max())
+
+    day_index = calendar_day_index(calendar, data[date_col])
+    for col in columns:
+        data[col] = calendar[col].array.take(day_index)
+
+    return data
+
+
+# One Row per Calendar Week
+def calendar_weeks(calendar):
+    return calendar.drop_duplicates("YEAR_WEEK").reset_index(drop=True)
+
+
+# Gather Rows of a Keyed Table (e.g. calendar weeks) Into a Frame
+def gather_by_key(data, table, key_col, columns):
+    row_index = pd.Index(table[key_col]).get_indexer(data[key_col])
+    if (row_index < 0).any():
+        raise ValueError(f"Values of {key_col} missing from the lookup table.")
+
+    for col in columns:
+        data[col] = table[col].array.take(row_index)
+
+    return data
+
+
+#                                           #
+# ----------------------------------------- #
@@ -0,0 +1,111 @@
+# ----------------------------------------- #
+#                  MODULES                  #
+
+# Standard Modules
+import json
+import os
+
+# Third-Party Modules
+import pandas as pd
+
+#                                           #
+# ----------------------------------------- #
+
+# ----------------------------------------- #
+#                PARAMETERS                 #
+
+# String Columns Stored as Categoricals / Arrow Dictionaries
+CATEGORICAL_COLUMNS = ["SPECIES", "LOCATION", "DAM", "POD_TYPE", "POD_TAG", "H3_CELL"]
+
+# Persisted Category Sets (ignored by Arrow dataset discovery: "_" prefix)
+CATEGORIES_FILE = "_categories.json"
+
+#                                           #
+# ----------------------------------------- #
+
+# ----------------------------------------- #
+#                 FUNCTIONS                 #
+
+
+# Category File Next to a Dataset (directory) or File
+def _categories_path(path):
+    if os.path.isdir(path):
+        return os.path.join(path, CATEGORIES_FILE)
+    return os.path.join(os.path.dirname(path), CATEGORIES_FILE)
+
+
+# Read Persisted Category Sets
+def read_category_sets(path):
+    categories_path = _categories_path(path)
+    if not os.path.exists(categories_path):
+        return {}
+    with open(categories_path) as f:
+        return json.load(f)
+
+
+# Persist Category Sets (append-only, so existing codes never move)
+def write_category_sets(data, path, columns=CATEGORICAL_COLUMNS):
+    """
+    Record the category set of each categorical column next to the data.
+
+    Existing categories keep their position and new values are appended in
+    sorted order, so integer codes stay stable across refreshes.
+
+    Parameters:
+        data (pd.DataFrame): Data being written.
+        path (str): Dataset directory (or file, whose directory is used).
+        columns (list): Candidate categorical columns (missing ones skipped).
+
+    Returns:
+        dict: Column -> list of categories, as persisted.
+    """
+    category_sets = read_category_sets(path)
+
+    for col in columns:
+        if col not in data.columns:
+            continue
+        known = category_sets.get(col, [])
+        values = pd.Series(data[col].dropna().unique()).astype(str)
+        category_sets[col] = known + sorted(set(values) - set(known))
+
+    categories_path = _categories_path(path)
+    os.makedirs(os.path.dirname(categories_path) or ".", exist_ok=True)
+    with open(f"{categories_path}.tmp", "w") as f:
+        json.dump(category_sets, f, indent=1)
+    os.replace(f"{categories_path}.tmp", categories_path)
+
+    return category_sets
+
+
+# Convert String Columns to Categoricals with Stable Categories
+def as_categoricals(data, category_sets=None, columns=CATEGORICAL_COLUMNS):
+    """
+    Convert string columns to pandas categoricals.
+
+    Categories come from the persisted set when available (values not yet
+    persisted are appended), otherwise from the sorted unique values.
+    """
+    category_sets = category_sets or {}
+
+    for col in columns:
+        if col not in data.columns:
+            continue
+        known = category_sets.get(col, [])
+        values = data[col]
+
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            # Already dictionary-encoded (e.g. Arrow) - only remap the codes
+            present = values.cat.categories.astype(str)
+            values = values.cat.rename_categories(present)
+            unseen = sorted(set(present) - set(known))
+            data[col] = values.cat.set_categories(known + unseen)
+        else:
+            values = values.where(values.isna(), values.astype(str))
+            unseen = sorted(set(values.dropna().unique()) - set(known))
+            data[col] = pd.Categorical(values, categories=known + unseen)
+
+    return data
+
+
+#                                           #
+# ----------------------------------------- #
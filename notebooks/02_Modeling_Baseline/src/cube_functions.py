@@ -0,0 +1,146 @@
+# ----------------------------------------- #
+#                  MODULES                  #
+
+# Third-Party Modules
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+#                                           #
+# ----------------------------------------- #
+
+# ----------------------------------------- #
+#                 FUNCTIONS                 #
+
+
+# Build Sparse Presence Cube (H3 Cell x Day)
+def build_presence_cube(
+    data,
+    start_date=None,
+    end_date=None,
+    count_col=None,
+    h3_col="H3_CELL",
+    date_col="DATE",
+):
+    """
+    Build a sparse H3 cell x day cube of sighting counts.
+
+    Cells are integer-coded in order of first appearance and days are offsets
+    from the first date of the window, so only observed (cell, day) pairs are
+    stored. Absences are implicit and only materialized by `cube_to_frame`.
+
+    Parameters:
+        data (pd.DataFrame): Sightings with an H3 cell and date column.
+        start_date (str or datetime, optional): First day of the cube.
+        end_date (str or datetime, optional): Last day of the cube.
+        count_col (str, optional): Column of per-row counts (defaults to 1/row).
+        h3_col (str): H3 cell column name.
+        date_col (str): Date column name.
+
+    Returns:
+        tuple: (counts, cells, dates) where counts is a CSR matrix of shape
+        (n_cells, n_days), cells the H3 ids per row and dates a DatetimeIndex
+        per column.
+    """
+    dates = pd.to_datetime(data[date_col]).dt.normalize()
+
+    # Cells Ever Observed (kept even if outside the date window)
+    cell_codes, cells = pd.factorize(data[h3_col])
+    cells = np.asarray(cells, dtype=object)
+
+    start_date = dates.min() if start_date is None else pd.Timestamp(start_date)
+    end_date = dates.max() if end_date is None else pd.Timestamp(end_date)
+    all_dates = pd.date_range(start=start_date, end=end_date, freq="D")
+
+    # Day Offsets Within Window
+    day_offsets = (dates - all_dates[0]).dt.days.to_numpy()
+    in_window = (day_offsets >= 0) & (day_offsets < len(all_dates))
+
+    if count_col is None:
+        values = np.ones(in_window.sum(), dtype=np.int32)
+    else:
+        values = data[count_col].to_numpy()[in_window].astype(np.int32)
+
+    # Duplicate (cell, day) entries are summed on conversion to CSR
+    counts = sparse.coo_matrix(
+        (values, (cell_codes[in_window], day_offsets[in_window])),
+        shape=(len(cells), len(all_dates)),
+    ).tocsr()
+
+    return counts, cells, all_dates
+
+
+# Resolve Date Window to Column Slice
+def _cube_window(dates, start_date=None, end_date=None):
+    start = 0 if start_date is None else dates.searchsorted(pd.Timestamp(start_date))
+    stop = (
+        len(dates)
+        if end_date is None
+        else dates.searchsorted(pd.Timestamp(end_date), side="right")
+    )
+    return start, stop
+
+
+# Materialize a Window of the Cube
+def cube_to_frame(cube, start_date=None, end_date=None, absences=False):
+    """
+    Materialize (part of) a presence cube as a long DataFrame.
+
+    With absences, the output columns are allocated once and only the
+    window's stored counts are scattered into COUNT - the absent
+    (cell, day) pairs are the zeros left around them, so the window is
+    never densified.
+
+    Parameters:
+        cube (tuple): (counts, cells, dates) from `build_presence_cube`.
+        start_date (str or datetime, optional): First day to materialize.
+        end_date (str or datetime, optional): Last day to materialize.
+        absences (bool): If True, also return a zero row for every cell/day
+            without sightings (default: only cells/days with sightings).
+
+    Returns:
+        pd.DataFrame: H3_CELL (categorical over the cube's cells), DATE,
+        presence (0/1) and COUNT, ordered by cell then date.
+    """
+    counts, cells, dates = cube
+    start, stop = _cube_window(dates, start_date, end_date)
+    window = counts[:, start:stop].tocoo()
+    window_dates = dates[start:stop]
+    n_days = stop - start
+
+    if absences:
+        # Row of (cell, day) is cell * n_days + day; everything else is absent
+        cell_idx = np.repeat(np.arange(len(cells), dtype=np.int32), n_days)
+        values = np.zeros(len(cells) * n_days, dtype=window.dtype)
+        values[window.row.astype(np.int64) * n_days + window.col] = window.data
+        frame_dates = np.tile(window_dates.to_numpy(), len(cells))
+    else:
+        order = np.lexsort((window.col, window.row))
+        cell_idx = window.row[order]
+        values = window.data[order]
+        frame_dates = window_dates.to_numpy()[window.col[order]]
+
+    return pd.DataFrame(
+        {
+            "H3_CELL": pd.Categorical.from_codes(cell_idx, cells),
+            "DATE": frame_dates,
+            "presence": (values > 0).astype(float),
+            "COUNT": values,
+        },
+        copy=False,
+    )
+
+
+# Lazily Iterate Over Cube Windows
+def iter_cube_frames(cube, window_days=365, absences=False):
+    """Yield `cube_to_frame` output for consecutive windows of `window_days`."""
+    dates = cube[2]
+    for start in range(0, len(dates), window_days):
+        stop = min(start + window_days, len(dates)) - 1
+        yield cube_to_frame(
+            cube, start_date=dates[start], end_date=dates[stop], absences=absences
+        )
+
+
+#                                           #
+# ----------------------------------------- #
@@ -0,0 +1,198 @@
+# ----------------------------------------- #
+#                  MODULES                  #
+
+# Standard Modules
+import os
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Third-Party Modules
+import joblib
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.base import clone
+
+#                                           #
+# ----------------------------------------- #
+
+# ----------------------------------------- #
+#                 FUNCTIONS                 #
+
+
+# Fit Pipeline With Sample Weights (if supported)
+def safe_fit(clf, X, y, sample_weights=None):
+    """Fit pipeline safely with sample weights (if supported)."""
+    try:
+        if sample_weights is not None:
+            clf.fit(X, y, model__sample_weight=sample_weights)
+        else:
+            clf.fit(X, y)
+    except TypeError:
+        # Some models in pipelines ignore sample_weight
+        clf.fit(X, y)
+    return clf
+
+
+# Write Arrays Once, Load Them Back Memory-Mapped (read-only)
+def _memmap(folder, name, array):
+    path = os.path.join(folder, f"{name}.joblib")
+    joblib.dump(np.ascontiguousarray(array), path)
+    return joblib.load(path, mmap_mode="r")
+
+
+# Share a Feature Frame With Worker Processes
+def _share_frame(folder, X):
+    """
+    Memory-map every column of X; object/categorical columns are stored as
+    integer codes plus their (small) category array.
+    """
+    columns = {}
+    for i, col in enumerate(X.columns):
+        values = X[col]
+        if isinstance(values.dtype, pd.CategoricalDtype) or values.dtype == object:
+            codes, categories = pd.factorize(values)
+            columns[col] = (_memmap(folder, f"X{i}", codes), np.asarray(categories))
+        else:
+            columns[col] = (_memmap(folder, f"X{i}", values.to_numpy()), None)
+    return columns
+
+
+# Rebuild Rows of a Shared Frame in a Worker
+def _take_frame(columns, rows):
+    data = {}
+    for col, (values, categories) in columns.items():
+        if categories is None:
+            data[col] = values[rows]
+        else:
+            codes = values[rows]
+            data[col] = np.where(
+                codes >= 0, categories.take(codes, mode="clip"), np.nan
+            )
+    return pd.DataFrame(data)
+
+
+# Peak Resident Memory of This Process So Far (MB)
+def _peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024**2 if sys.platform == "darwin" else peak / 1024
+
+
+# Fit One Fold and Predict Its Validation Rows
+def _fit_fold(
+    clf, columns, y_codes, weights, classes, fold, train_idx, val_idx, trace_memory
+):
+    rss_before = _peak_rss_mb()
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+
+    clf = safe_fit(
+        clone(clf),
+        _take_frame(columns, train_idx),
+        classes[y_codes[train_idx]],
+        None if weights is None else weights[train_idx],
+    )
+    preds = clf.predict_proba(_take_frame(columns, val_idx))
+
+    # Align model classes to the global class order
+    aligned = np.zeros((len(val_idx), len(classes)))
+    aligned[:, np.searchsorted(classes, clf.classes_)] = preds
+
+    seconds = time.perf_counter() - start
+
+    report = {
+        "fold": fold,
+        "n_train": len(train_idx),
+        "n_val": len(val_idx),
+        "seconds": seconds,
+        "rss_growth_mb": _peak_rss_mb() - rss_before,
+        "pid": os.getpid(),
+    }
+    if trace_memory:
+        report["peak_mb"] = tracemalloc.get_traced_memory()[1] / 1024**2
+        tracemalloc.stop()
+    return aligned, report
+
+
+# Parallel Fold Executor (out-of-fold predictions)
+def run_cv_folds(
+    clf,
+    X,
+    y,
+    splits,
+    sample_weights=None,
+    n_jobs=-1,
+    verbose=True,
+    trace_memory=False,
+):
+    """
+    Fit an unfitted estimator on each CV fold and collect out-of-fold
+    probabilities.
+
+    X, y (as class codes) and the sample weights are written once to
+    memory-mapped files in a temporary folder; each worker process maps them
+    read-only and slices its own fold, so only indices are pickled per task.
+    Each fold's probabilities are written into a preallocated
+    (n_samples, n_classes) array, in the sorted class order of `y`.
+
+    Parameters:
+        clf (estimator): Unfitted estimator/pipeline (cloned per fold).
+        X (pd.DataFrame): Features.
+        y (array-like): Labels.
+        splits (list): (train_idx, val_idx) positional index pairs.
+        sample_weights (array-like, optional): Per-row weights (positional).
+        n_jobs (int): Worker processes (-1 uses all cores, 1 runs in-process).
+        verbose (bool): Print the per-fold report.
+        trace_memory (bool): Also trace Python allocations with tracemalloc
+            (peak_mb column) - slows the fits down and misses native buffers
+            (e.g. XGBoost/LightGBM), so seconds are only for sizing when off.
+
+    Returns:
+        tuple: (out-of-fold probabilities, per-fold report with fit+predict
+        seconds and how far the fold raised its worker's peak resident
+        memory (rss_growth_mb) - workers are reused across folds and the OS
+        peak never resets, so a fold that stays under an earlier peak
+        reports 0).
+    """
+    classes, y_codes = np.unique(np.asarray(y), return_inverse=True)
+    weights = None if sample_weights is None else np.asarray(sample_weights)
+    oof_preds = np.zeros((len(X), len(classes)))
+
+    with tempfile.TemporaryDirectory() as folder:
+        columns = _share_frame(folder, X)
+        y_shared = _memmap(folder, "y", y_codes)
+        w_shared = None if weights is None else _memmap(folder, "w", weights)
+
+        outputs = Parallel(n_jobs=n_jobs)(
+            delayed(_fit_fold)(
+                clf,
+                columns,
+                y_shared,
+                w_shared,
+                classes,
+                fold,
+                train_idx,
+                val_idx,
+                trace_memory,
+            )
+            for fold, (train_idx, val_idx) in enumerate(splits)
+        )
+
+    reports = []
+    for (_, val_idx), (aligned, report) in zip(splits, outputs):
+        oof_preds[val_idx] = aligned
+        reports.append(report)
+
+    fold_report = pd.DataFrame(reports)
+    if verbose:
+        print(fold_report.round(2).to_string(index=False))
+
+    return oof_preds, fold_report
+
+
+#                                           #
+# ----------------------------------------- #
@@ -4,6 +4,7 @@
 # Standard Modules
 import os
 import warnings
+from datetime import date
 
 # Third-Party Modules
 import geopandas as gpd
@@ -11,8 +12,22 @@ import h3
 import numpy as np
 import pandas as pd
 import plotly.express as px
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
 from shapely.geometry import box, Point, Polygon
 
+# Built Modules
+from src.calendar_functions import add_calendar_features
+from src.category_functions import (
+    CATEGORICAL_COLUMNS,
+    as_categoricals,
+    read_category_sets,
+    write_category_sets,
+)
+from src.cube_functions import build_presence_cube, cube_to_frame
+from src.h3_functions import assign_h3_cells
+
 #                                           #
 # ----------------------------------------- #
 
@@ -20,19 +35,170 @@ from shapely.geometry import box, Point, Polygon
 #                 FUNCTIONS                 #
 
 
+# Filter Operators (pyarrow / pandas `filters` convention)
+FILTER_OPERATORS = {
+    "==": lambda col, val: col == val,
+    "=": lambda col, val: col == val,
+    "!=": lambda col, val: col != val,
+    "<": lambda col, val: col < val,
+    "<=": lambda col, val: col <= val,
+    ">": lambda col, val: col > val,
+    ">=": lambda col, val: col >= val,
+    "in": lambda col, val: col.isin(val),
+    "not in": lambda col, val: ~col.isin(val),
+}
+
+
+# Build Arrow Filter Expression - values are cast to the dataset's column types
+def _arrow_filter_expression(schema, filters):
+    expression = None
+    for col, op, val in filters:
+        field_type = schema.field(col).type
+        if pa.types.is_dictionary(field_type):
+            field_type = field_type.value_type
+        if op in ("in", "not in"):
+            val = pc.cast(pa.array(list(val)), field_type, safe=False)
+        else:
+            val = pc.cast(pa.scalar(val), field_type, safe=False)
+
+        if op == "in":
+            condition = pc.field(col).isin(val)
+        elif op == "not in":
+            condition = ~pc.field(col).isin(val)
+        else:
+            condition = FILTER_OPERATORS[op](pc.field(col), val)
+
+        expression = condition if expression is None else expression & condition
+    return expression
+
+
+# Apply Filters in Pandas (CSV sources)
+def _pandas_filter_mask(data, filters):
+    mask = np.ones(len(data), dtype=bool)
+    for col, op, val in filters:
+        column = data[col]
+        if isinstance(val, (date, np.datetime64)):
+            column = pd.to_datetime(column)
+        mask &= np.asarray(FILTER_OPERATORS[op](column, val))
+    return mask
+
+
 # Data Opener for Sightings Data
-def open_sightings(path):
-    if os.path.exists(path):
-        if ".csv" in path:
-            sightings = pd.read_csv(path)
-            return sightings
-        elif ".parquet" in path:
-            sightings = pd.read_parquet(path)
-            return sightings
-    #     else:
-    #         raise "WARNING: Unsupported file type - supported types include parquet and csv"
-    else:
+def open_sightings(path, columns=None, filters=None, batch_size=None, categorical=True):
+    """
+    Open sightings from CSV, a Parquet file or a (hive-partitioned) Parquet dataset.
+
+    Parameters:
+        path (str): CSV file, Parquet file or dataset directory
+            (e.g. ORCA_SIGHTINGS/YEAR=2024/POD_TYPE=SRKW/part-0.parquet).
+        columns (list, optional): Columns to read.
+        filters (list, optional): (column, op, value) tuples ANDed together,
+            e.g. [("POD_TYPE", "==", "SRKW"), ("DATE", ">=", "2024-05-01")].
+            For Parquet they are pushed into the Arrow scanner, so partitions
+            and row groups that cannot match are never read.
+        batch_size (int, optional): If set, return an iterator of DataFrames
+            of at most `batch_size` rows instead of one DataFrame.
+        categorical (bool): Load POD_TYPE, POD_TAG, H3_CELL, ... as
+            categoricals (Arrow dictionaries for Parquet) with the category
+            set persisted next to the data, so codes match across reads.
+
+    Returns:
+        pd.DataFrame or iterator of pd.DataFrame
+    """
+    if not os.path.exists(path):
         print("WARNING: Path does not exist.")
+        return None
+
+    category_sets = read_category_sets(path) if categorical else None
+
+    if ".csv" in path:
+        if batch_size is not None:
+            return _iter_csv_sightings(
+                path, columns, filters, batch_size, category_sets
+            )
+        sightings = pd.read_csv(path)
+        if filters:
+            sightings = sightings[_pandas_filter_mask(sightings, filters)]
+        sightings = sightings if columns is None else sightings[columns]
+        return _as_sighting_categoricals(sightings, category_sets)
+
+    elif os.path.isdir(path) or ".parquet" in path:
+        dataset = _open_sightings_dataset(path, categorical)
+        scan_filter = (
+            _arrow_filter_expression(dataset.schema, filters) if filters else None
+        )
+        if batch_size is not None:
+            batches = dataset.to_batches(
+                columns=columns, filter=scan_filter, batch_size=batch_size
+            )
+            return (
+                _as_sighting_categoricals(batch.to_pandas(), category_sets)
+                for batch in batches
+            )
+        sightings = dataset.to_table(columns=columns, filter=scan_filter).to_pandas()
+        return _as_sighting_categoricals(sightings, category_sets)
+
+    else:
+        print("WARNING: Path is not a supported file type.")
+
+
+# Open Parquet Sightings as an Arrow Dataset
+def _open_sightings_dataset(path, categorical=True):
+    if not categorical:
+        return ds.dataset(path, format="parquet", partitioning="hive")
+
+    # String columns are read straight into dictionaries (no per-row strings)
+    parquet_format = ds.ParquetFileFormat(
+        read_options=ds.ParquetReadOptions(dictionary_columns=CATEGORICAL_COLUMNS)
+    )
+    return ds.dataset(
+        path,
+        format=parquet_format,
+        partitioning=ds.HivePartitioning.discover(infer_dictionary=True),
+    )
+
+
+# Categorical Sighting Columns (None = keep strings)
+def _as_sighting_categoricals(sightings, category_sets):
+    if category_sets is None:
+        return sightings
+
+    # Other dictionary partition keys (e.g. YEAR) go back to plain values
+    for col in sightings.columns:
+        values = sightings[col]
+        if col not in CATEGORICAL_COLUMNS and isinstance(
+            values.dtype, pd.CategoricalDtype
+        ):
+            sightings[col] = values.astype(values.cat.categories.dtype)
+
+    return as_categoricals(sightings, category_sets)
+
+
+# Stream CSV Sightings in Chunks
+def _iter_csv_sightings(path, columns, filters, batch_size, category_sets=None):
+    for chunk in pd.read_csv(path, chunksize=batch_size):
+        if filters:
+            chunk = chunk[_pandas_filter_mask(chunk, filters)]
+        chunk = chunk if columns is None else chunk[columns]
+        yield _as_sighting_categoricals(chunk, category_sets)
+
+
+# Write Sightings as a Hive-Partitioned Parquet Dataset
+def write_sightings_dataset(sightings, path, partition_cols=("YEAR", "POD_TYPE")):
+    # Persist category sets first so readers always find every written value
+    os.makedirs(path, exist_ok=True)
+    write_category_sets(sightings, path)
+
+    table = pa.Table.from_pandas(sightings, preserve_index=False)
+    ds.write_dataset(
+        table,
+        path,
+        format="parquet",
+        partitioning=list(partition_cols),
+        partitioning_flavor="hive",
+        existing_data_behavior="delete_matching",
+    )
+    return path
 
 
 # Quick Preprocess on Read of Sightings Data
@@ -53,79 +219,60 @@ def h3_to_polygon(h3_index):
     return Polygon(boundary_lonlat)
 
 
-# Load Data
-def load_sightings_data(SIGHTINGS_PATH, POD_TYPE, H3_RESOLUTION, start_date, end_date):
-    sightings = open_sightings(path=SIGHTINGS_PATH)
-    sightings = quick_preprocess(sightings)
-    sightings["DATE"] = pd.to_datetime(sightings["DATE"])
-
-    # Filter to Pod Type
-    sightings = sightings[sightings["POD_TYPE"] == POD_TYPE].copy()
+# Load Sightings as a Sparse H3 Cell x Day Cube
+def load_sightings_cube(SIGHTINGS_PATH, POD_TYPE, H3_RESOLUTION, start_date, end_date):
+    # Pod type and counts are pushed down to the reader - the date window is
+    # applied by the cube, which keeps every cell ever observed
+    filters = [("POD_TYPE", "==", POD_TYPE), ("COUNT", ">", 0)]
 
-    # Expand by COUNT
-    sightings_expanded = sightings.loc[
-        sightings.index.repeat(sightings["COUNT"])
-    ].reset_index(drop=True)
-
-    # Assign H3 cell (parallelized with swifter)
-    sightings_expanded["H3_CELL"] = sightings_expanded.apply(
-        lambda x: h3.latlng_to_cell(x["LATITUDE"], x["LONGITUDE"], H3_RESOLUTION),
-        axis=1,
+    sightings = open_sightings(
+        path=SIGHTINGS_PATH,
+        columns=["DATE", "LATITUDE", "LONGITUDE", "POD_TYPE", "COUNT"],
+        filters=filters,
     )
+    sightings = quick_preprocess(sightings).reset_index(drop=True)
+    sightings["DATE"] = pd.to_datetime(sightings["DATE"])
 
-    # Generate binary target
-    sightings_expanded["presence"] = 1
-
-    # Generate absence rows (only for H3 cells that have ever had a sighting)
-    h3_cells = sightings_expanded["H3_CELL"].unique()
-
-    if start_date is None:
-        start_date = sightings_expanded["DATE"].min()
-    if end_date is None:
-        end_date = sightings_expanded["DATE"].max()
+    # Assign H3 cell (batched over unique coordinates)
+    sightings = assign_h3_cells(sightings, H3_RESOLUTION, as_category=True)
 
-    all_dates = pd.date_range(start=start_date, end=end_date, freq="D")
-    all_h3_dates = pd.MultiIndex.from_product(
-        [h3_cells, all_dates], names=["H3_CELL", "DATE"]
+    # Presence counts per (H3_CELL, DATE) - absences stay implicit
+    return build_presence_cube(
+        sightings, start_date=start_date, end_date=end_date, count_col="COUNT"
     )
-    absence_df = pd.DataFrame(index=all_h3_dates).reset_index()
 
-    # Merge with sightings to mark presence
-    df_model = absence_df.merge(
-        sightings_expanded[["H3_CELL", "DATE", "presence"]],
-        on=["H3_CELL", "DATE"],
-        how="left",
+
+# Load Data
+def load_sightings_data(
+    SIGHTINGS_PATH, POD_TYPE, H3_RESOLUTION, start_date, end_date, absences=False
+):
+    cube = load_sightings_cube(
+        SIGHTINGS_PATH, POD_TYPE, H3_RESOLUTION, start_date, end_date
     )
 
-    # Fill NaN with 0 for absence
-    df_model["presence"] = df_model["presence"].fillna(0)
+    # Materialize presence rows, plus absence rows if asked for (only for H3
+    # cells that have ever had a sighting) - use `load_sightings_cube` and
+    # `iter_cube_frames` to stream windows instead
+    df_model = cube_to_frame(cube, absences=absences)
 
-    # Only keep unique rows per H3_CELL/DATE for merge
-    temporal_lookup = sightings_expanded[["H3_CELL", "DATE"]].drop_duplicates(
-        subset=["H3_CELL", "DATE"]
-    )
-    df_model = df_model.merge(temporal_lookup, on=["H3_CELL", "DATE"], how="left")
+    # One row per H3_CELL/DATE - WEIGHT is the number of COUNT-expanded rows it
+    # stands for, so fitting with sample_weight=WEIGHT matches the expanded data
+    df_model["WEIGHT"] = df_model["COUNT"].clip(lower=1).astype(float)
+    df_model = df_model.drop(columns="COUNT")
 
     return df_model
 
 
+# Expand Weighted Rows Back to One Row per Counted Sighting
+def expand_weighted_rows(df_model, weight_col="WEIGHT"):
+    expanded = df_model.loc[df_model.index.repeat(df_model[weight_col])]
+    return expanded.drop(columns=weight_col).reset_index(drop=True)
+
+
 # Preprocess Data
-def add_features_sightings_data(df_model):
-    # Add Temporal Features
-    df_model["DOY"] = df_model["DATE"].dt.day_of_year
-    df_model["DOW"] = df_model["DATE"].dt.day_of_week
-    df_model["WOY"] = df_model["DATE"].dt.isocalendar().week
-    df_model["MONTH"] = df_model["DATE"].dt.month
-    df_model["YEAR"] = df_model["DATE"].dt.year
-
-    df_model["MONTH_SIN"] = np.sin(2 * np.pi * df_model["MONTH"] / 12)
-    df_model["MONTH_COS"] = np.cos(2 * np.pi * df_model["MONTH"] / 12)
-
-    df_model["DOY_SIN"] = np.sin(2 * np.pi * df_model["MONTH"] / 12)
-    df_model["DOY_COS"] = np.cos(2 * np.pi * df_model["MONTH"] / 12)
-
-    df_model["WOY_SIN"] = np.sin(2 * np.pi * df_model["WOY"] / 52)
-    df_model["WOY_COS"] = np.cos(2 * np.pi * df_model["WOY"] / 52)
+def add_features_sightings_data(df_model, calendar=None):
+    # Add Temporal Features - computed once per day, gathered by day index
+    df_model = add_calendar_features(df_model, calendar)
 
     df_model = df_model.reset_index(drop=True)
 
@@ -0,0 +1,125 @@
+# ----------------------------------------- #
+#                  MODULES                  #
+
+# Third-Party Modules
+import numpy as np
+import pandas as pd
+from numba import njit
+
+#                                           #
+# ----------------------------------------- #
+
+# ----------------------------------------- #
+#                PARAMETERS                 #
+
+# Default Lags (days) and Rolling Windows (days, ending the day before)
+LAG_DAYS = [1, 2, 3, 7, 13, 26, 52, 56]
+ROLLING_WINDOWS = [3, 7, 14]
+
+#                                           #
+# ----------------------------------------- #
+
+# ----------------------------------------- #
+#                 FUNCTIONS                 #
+
+
+# Lag + Rolling Kernel (one pass over a cell-major array)
+@njit(cache=True)
+def _lag_roll_kernel(values, group_starts, lags, windows, offset, fill_value):
+    n_rows = values.shape[0]
+    n_lags = lags.shape[0]
+    out = np.empty((n_rows, n_lags + windows.shape[0]), dtype=np.float32)
+
+    # Running sums / non-missing counts of the current cell's values
+    prefix_sum = np.zeros(n_rows + 1)
+    prefix_n = np.zeros(n_rows + 1, dtype=np.int64)
+
+    for g in range(group_starts.shape[0] - 1):
+        start, stop = group_starts[g], group_starts[g + 1]
+        prefix_sum[start] = 0.0
+        prefix_n[start] = 0
+
+        for i in range(start, stop):
+            p = i - start
+
+            # Lags - missing before the cell's first day
+            for j in range(n_lags):
+                lag = lags[j] + offset
+                value = values[i - lag] if p >= lag else np.nan
+                out[i, j] = fill_value if np.isnan(value) else value
+
+            # Rolling sums of the `window` days before `offset` (min_periods=1)
+            hi = start + max(p - offset, 0)
+            for j in range(windows.shape[0]):
+                lo = start + max(p - offset - windows[j], 0)
+                if prefix_n[hi] - prefix_n[lo] > 0:
+                    out[i, n_lags + j] = prefix_sum[hi] - prefix_sum[lo]
+                else:
+                    out[i, n_lags + j] = fill_value
+
+            if np.isnan(values[i]):
+                prefix_sum[i + 1] = prefix_sum[i]
+                prefix_n[i + 1] = prefix_n[i]
+            else:
+                prefix_sum[i + 1] = prefix_sum[i] + values[i]
+                prefix_n[i + 1] = prefix_n[i] + 1
+
+    return out
+
+
+# Per-Cell Lag + Rolling Features
+def lag_roll_features(
+    data,
+    value_col="presence",
+    group_col="H3_CELL",
+    lags=LAG_DAYS,
+    windows=ROLLING_WINDOWS,
+    offset=0,
+    fill_value=0.0,
+):
+    """
+    Compute per-cell lag and rolling-sum features in one compiled pass.
+
+    Matches `groupby(group_col)[value_col].shift(lag)` for each lag and
+    `groupby(group_col)[value_col].shift(1).rolling(window, min_periods=1)
+    .sum()` per cell for each window, with missing values set to `fill_value`.
+    A non-zero `offset` shifts every lag and window back by that many rows
+    (features for a direct forecast `offset + 1` days ahead).
+
+    Parameters:
+        data (pd.DataFrame): Rows sorted cell-major (by group_col, then date),
+            one row per cell and day.
+        value_col (str): Column to lag / sum.
+        group_col (str): Cell column.
+        lags (list): Lags in rows (days).
+        windows (list): Rolling window lengths in rows (days).
+        offset (int): Extra rows (days) to shift all lags and windows back.
+        fill_value (float): Value for lags/windows with no history.
+
+    Returns:
+        tuple: (float32 matrix of shape (n_rows, len(lags) + len(windows)),
+        column names `lag_{l}` then `roll_{w}`).
+    """
+    codes, _ = pd.factorize(data[group_col])
+    group_starts = np.flatnonzero(np.diff(codes)) + 1
+
+    if len(group_starts) + 1 != codes.max(initial=-1) + 1 and len(codes):
+        raise ValueError(f"Rows must be sorted by {group_col} (cell-major).")
+
+    group_starts = np.concatenate([[0], group_starts, [len(codes)]]).astype(np.int64)
+
+    features = _lag_roll_kernel(
+        data[value_col].to_numpy(dtype=np.float64),
+        group_starts,
+        np.asarray(lags, dtype=np.int64),
+        np.asarray(windows, dtype=np.int64),
+        int(offset),
+        float(fill_value),
+    )
+    columns = [f"lag_{lag}" for lag in lags] + [f"roll_{w}" for w in windows]
+
+    return features, columns
+
+
+#                                           #
+# ----------------------------------------- #
@@ -0,0 +1,354 @@
+# ----------------------------------------- #
+#                  MODULES                  #
+
+# Third-Party Modules
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from scipy import sparse
+from sklearn.base import clone
+
+# Built Modules
+from src.calendar_functions import CALENDAR_FEATURES, build_calendar
+from src.feature_functions import lag_roll_features
+
+#                                           #
+# ----------------------------------------- #
+
+# ----------------------------------------- #
+#                 FUNCTIONS                 #
+
+
+# Parse Lags / Windows From Feature Names (lag_{l}, roll_{w})
+def _parse_lag_roll_cols(lag_roll_cols):
+    lags, windows = [], []
+    for col in lag_roll_cols:
+        kind, days = col.rsplit("_", 1)
+        if kind == "lag":
+            lags.append(int(days))
+        elif kind == "roll":
+            windows.append(int(days))
+        else:
+            raise ValueError(f"Unsupported lag/rolling column: {col}")
+    return lags, windows
+
+
+# Seed Per-Cell Ring Buffer From Observed History
+def _seed_ring_buffer(cells, start_date, buffer_days, history, h3_col):
+    buffer = np.zeros((len(cells), buffer_days), dtype=np.float64)
+    if history is None:
+        return buffer
+
+    day = (pd.to_datetime(history["DATE"]) - start_date).dt.days.to_numpy()
+    cell_index = pd.Index(cells).get_indexer(history[h3_col])
+    keep = (day <= 0) & (day > -buffer_days) & (cell_index >= 0)
+
+    values = np.nan_to_num(history["presence"].to_numpy(dtype=np.float64)[keep])
+    buffer[cell_index[keep], day[keep] % buffer_days] = values
+
+    return buffer
+
+
+# Lag / Rolling Features for the Day After the Origin (day 0)
+def _origin_lag_roll(buffer, lag_roll_cols):
+    buffer_days = buffer.shape[1]
+    X_lag_roll = np.empty((buffer.shape[0], len(lag_roll_cols)))
+
+    for j, col in enumerate(lag_roll_cols):
+        kind, days = col.rsplit("_", 1)
+        if kind == "lag":
+            X_lag_roll[:, j] = buffer[:, (1 - int(days)) % buffer_days]
+        else:
+            X_lag_roll[:, j] = buffer[
+                :, [-k % buffer_days for k in range(int(days))]
+            ].sum(axis=1)
+
+    return X_lag_roll
+
+
+# Recursive Forecast - Incremental Per-Cell State
+def recursive_forecast_clean(
+    model,
+    df_last,
+    ohe,
+    scaler,
+    lag_roll_cols,
+    temporal_cols,
+    h3_col="H3_CELL",
+    n_days=7,
+    thresh_=0.5,
+    calendar=None,
+    history=None,
+):
+    """
+    Forecast presence day by day, feeding predictions back as lag features.
+
+    Each cell keeps a ring buffer of its recent (observed, then predicted)
+    presence, so lags are read in place and rolling sums are updated by the
+    day entering and the day leaving each window. The H3/MONTH one-hot block
+    is transformed once per month and the scaled calendar features once per
+    day; only the lag/rolling block changes between steps.
+
+    Parameters:
+        model: Fitted classifier with `predict_proba`.
+        df_last (pd.DataFrame): One row per H3 cell, all on the last observed DATE.
+        ohe (OneHotEncoder): Encoder fit on [h3_col, "MONTH"].
+        scaler: Fitted scaler for `temporal_cols`.
+        lag_roll_cols (list): `lag_{l}` / `roll_{w}` columns, in model order.
+        temporal_cols (list): Scaled columns, in model order.
+        h3_col (str): H3 cell column name.
+        n_days (int): Days to forecast.
+        thresh_ (float): Probability threshold for `presence_pred`.
+        calendar (pd.DataFrame, optional): Calendar covering the forecast days.
+        history (pd.DataFrame, optional): Observed h3_col/DATE/presence up to
+            the last DATE, used to seed the lags (zeros otherwise).
+
+    Returns:
+        pd.DataFrame: DATE, h3_col, presence_pred and proba per cell and day.
+    """
+    start_dates = pd.to_datetime(df_last["DATE"]).unique()
+    if len(start_dates) != 1:
+        raise ValueError("All df_last rows must share the same DATE.")
+    start_date = pd.Timestamp(start_dates[0])
+
+    cells = df_last[h3_col].to_numpy()
+    n_cells = len(cells)
+    forecast_dates = pd.date_range(
+        start_date + pd.Timedelta(days=1), periods=n_days, freq="D"
+    )
+
+    # Calendar Rows for the Forecast Days
+    if calendar is None:
+        calendar = build_calendar(forecast_dates[0], forecast_dates[-1])
+    calendar = calendar.set_index("DATE").loc[forecast_dates]
+
+    # Per-Cell Ring Buffer (slot d % buffer_days holds day d, day 0 = start_date)
+    lags, windows = _parse_lag_roll_cols(lag_roll_cols)
+    buffer_days = max(lags + windows)
+    buffer = _seed_ring_buffer(cells, start_date, buffer_days, history, h3_col)
+    roll_sums = {
+        w: buffer[:, [-k % buffer_days for k in range(w)]].sum(axis=1) for w in windows
+    }
+
+    # Scaled Features - one row per day if they are all calendar features
+    per_day_temporal = all(col in CALENDAR_FEATURES for col in temporal_cols)
+    static_temporal = df_last.reindex(columns=temporal_cols)
+
+    ohe_blocks = {}
+    X_dense = np.empty((n_cells, len(temporal_cols) + len(lag_roll_cols)))
+    proba = np.empty((n_days, n_cells))
+
+    for day in range(1, n_days + 1):
+        day_features = calendar.iloc[[day - 1]]
+
+        # One-Hot H3/MONTH Block (cached per month)
+        month = day_features["MONTH"].iloc[0]
+        if month not in ohe_blocks:
+            ohe_blocks[month] = ohe.transform(
+                pd.DataFrame({h3_col: cells, "MONTH": np.repeat(month, n_cells)})
+            ).tocsr()
+
+        # Scaled Temporal Block
+        if per_day_temporal:
+            X_dense[:, : len(temporal_cols)] = scaler.transform(
+                day_features[temporal_cols]
+            )
+        else:
+            for col in temporal_cols:
+                if col in CALENDAR_FEATURES:
+                    static_temporal[col] = day_features[col].iloc[0]
+            X_dense[:, : len(temporal_cols)] = scaler.transform(static_temporal)
+
+        # Lag / Rolling Block From the Ring Buffer
+        for j, col in enumerate(lag_roll_cols):
+            kind, days = col.rsplit("_", 1)
+            if kind == "lag":
+                values = buffer[:, (day - int(days)) % buffer_days]
+            else:
+                values = roll_sums[int(days)]
+            X_dense[:, len(temporal_cols) + j] = values
+
+        # Predict
+        X_input = sparse.hstack(
+            [ohe_blocks[month], sparse.csr_matrix(X_dense)], format="csr"
+        )
+        proba[day - 1] = model.predict_proba(X_input)[:, 1]
+        presence_pred = (proba[day - 1] >= thresh_).astype(float)
+
+        # Slide Windows (day leaving each window read before its slot is reused)
+        for w in windows:
+            roll_sums[w] = (
+                roll_sums[w] + presence_pred - buffer[:, (day - w) % buffer_days]
+            )
+        buffer[:, day % buffer_days] = presence_pred
+
+    return pd.DataFrame(
+        {
+            "DATE": np.repeat(forecast_dates, n_cells),
+            h3_col: np.tile(cells, n_days),
+            "presence_pred": (proba.ravel() >= thresh_).astype(float),
+            "proba": proba.ravel(),
+        }
+    )
+
+
+# Fit One Horizon's Model
+def _fit_horizon(base_model, X, y, sample_weight):
+    model = clone(base_model)
+    model.fit(X, y, sample_weight=sample_weight)
+    return model
+
+
+# Direct Multi-Horizon Models (one per horizon)
+def fit_direct_models(
+    base_model,
+    data,
+    ohe,
+    scaler,
+    lag_roll_cols,
+    temporal_cols,
+    horizons=7,
+    train_mask=None,
+    h3_col="H3_CELL",
+    value_col="presence",
+    weight_col="WEIGHT",
+    n_jobs=1,
+):
+    """
+    Fit one model per forecast horizon for `direct_forecast`.
+
+    The model for horizon h sees the calendar features of the target day and
+    lag/rolling features shifted back h - 1 days, so every horizon only uses
+    presence observed up to the forecast origin.
+
+    Parameters:
+        base_model: Unfitted classifier, cloned for each horizon.
+        data (pd.DataFrame): Cell-major model frame (as for `lag_roll_features`).
+        ohe (OneHotEncoder): Encoder fit on [h3_col, "MONTH"].
+        scaler: Fitted scaler for `temporal_cols`.
+        lag_roll_cols (list): `lag_{l}` / `roll_{w}` columns, in model order.
+        temporal_cols (list): Scaled columns, in model order.
+        horizons (int): Number of days ahead (one model per day).
+        train_mask (array-like, optional): Boolean mask of training rows.
+        h3_col (str): H3 cell column name.
+        value_col (str): Presence column (target and lag source).
+        weight_col (str, optional): Sample weight column.
+        n_jobs (int): Horizons fit in parallel (threads).
+
+    Returns:
+        dict: Horizon (1..horizons) -> fitted model.
+    """
+    lags, windows = _parse_lag_roll_cols(lag_roll_cols)
+    train_mask = (
+        np.ones(len(data), dtype=bool) if train_mask is None else np.asarray(train_mask)
+    )
+
+    # Blocks Shared by All Horizons
+    X_shared = sparse.hstack(
+        [ohe.transform(data[[h3_col, "MONTH"]]), scaler.transform(data[temporal_cols])],
+        format="csr",
+    )[train_mask]
+    y = data[value_col].to_numpy()[train_mask]
+    sample_weight = (
+        None if weight_col is None else data[weight_col].to_numpy()[train_mask]
+    )
+
+    def _horizon_matrix(horizon):
+        X_lag_roll, _ = lag_roll_features(
+            data, value_col, h3_col, lags, windows, offset=horizon - 1
+        )
+        return sparse.hstack([X_shared, X_lag_roll[train_mask]], format="csr")
+
+    models = Parallel(n_jobs=n_jobs, prefer="threads")(
+        delayed(_fit_horizon)(base_model, _horizon_matrix(h), y, sample_weight)
+        for h in range(1, horizons + 1)
+    )
+
+    return dict(zip(range(1, horizons + 1), models))
+
+
+# Direct Multi-Horizon Forecast (all horizons scored in one batch)
+def direct_forecast(
+    models,
+    df_last,
+    ohe,
+    scaler,
+    lag_roll_cols,
+    temporal_cols,
+    h3_col="H3_CELL",
+    thresh_=0.5,
+    calendar=None,
+    history=None,
+    n_jobs=-1,
+):
+    """
+    Forecast every cell for every horizon without feeding predictions back.
+
+    The lag/rolling block is built once at the forecast origin (shared by all
+    horizons); the rows of all horizons are stacked into one matrix and each
+    horizon's model scores its slice, with the models run in parallel.
+
+    Parameters:
+        models (dict): Horizon -> fitted model, from `fit_direct_models`.
+        df_last (pd.DataFrame): One row per H3 cell, all on the last observed DATE.
+        n_jobs (int): Models scored in parallel (threads).
+        Other parameters as for `recursive_forecast_clean`.
+
+    Returns:
+        pd.DataFrame: DATE, h3_col, presence_pred and proba per cell and day.
+    """
+    start_dates = pd.to_datetime(df_last["DATE"]).unique()
+    if len(start_dates) != 1:
+        raise ValueError("All df_last rows must share the same DATE.")
+    start_date = pd.Timestamp(start_dates[0])
+
+    horizons = sorted(models)
+    cells = df_last[h3_col].to_numpy()
+    n_cells = len(cells)
+    forecast_dates = start_date + pd.to_timedelta(horizons, unit="D")
+
+    # Calendar Rows for the Forecast Days
+    if calendar is None:
+        calendar = build_calendar(forecast_dates.min(), forecast_dates.max())
+    day_features = calendar.set_index("DATE").loc[forecast_dates].reset_index()
+
+    # Lag / Rolling Block at the Origin (day 1 features of every horizon)
+    lags, windows = _parse_lag_roll_cols(lag_roll_cols)
+    buffer_days = max(lags + windows)
+    buffer = _seed_ring_buffer(cells, start_date, buffer_days, history, h3_col)
+    X_lag_roll = _origin_lag_roll(buffer, lag_roll_cols)
+
+    # All Horizons x Cells in One Design Matrix (horizon-major)
+    rows = day_features.loc[np.repeat(np.arange(len(horizons)), n_cells)]
+    rows = rows.reset_index(drop=True)
+    rows[h3_col] = np.tile(cells, len(horizons))
+    X_input = sparse.hstack(
+        [
+            ohe.transform(rows[[h3_col, "MONTH"]]),
+            scaler.transform(rows[temporal_cols]),
+            np.tile(X_lag_roll, (len(horizons), 1)),
+        ],
+        format="csr",
+    )
+
+    # Score Each Horizon's Slice
+    probas = Parallel(n_jobs=n_jobs, prefer="threads")(
+        delayed(lambda model, X: model.predict_proba(X)[:, 1])(
+            models[h], X_input[i * n_cells : (i + 1) * n_cells]
+        )
+        for i, h in enumerate(horizons)
+    )
+    proba = np.concatenate(probas)
+
+    return pd.DataFrame(
+        {
+            "DATE": np.repeat(forecast_dates, n_cells),
+            h3_col: np.tile(cells, len(horizons)),
+            "presence_pred": (proba >= thresh_).astype(float),
+            "proba": proba,
+        }
+    )
+
+
+#                                           #
+# ----------------------------------------- #
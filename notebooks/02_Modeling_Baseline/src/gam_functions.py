@@ -0,0 +1,153 @@
+# ----------------------------------------- #
+#                  MODULES                  #
+
+# Standard Modules
+import os
+import tempfile
+
+# Third-Party Modules
+import joblib
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from pygam import LogisticGAM, s
+from sklearn.isotonic import IsotonicRegression
+from sklearn.model_selection import GroupKFold
+
+#                                           #
+# ----------------------------------------- #
+
+# ----------------------------------------- #
+#                PARAMETERS                 #
+
+# GAM Covariates (column order = term index)
+GAM_FEATURES = [
+    "LATITUDE",
+    "LONGITUDE",
+    "DOY_SIN",
+    "DOY_COS",
+    "MONTH_SIN",
+    "MONTH_COS",
+]
+
+#                                           #
+# ----------------------------------------- #
+
+# ----------------------------------------- #
+#                 FUNCTIONS                 #
+
+
+# GAM Terms - spatial splines + seasonal terms
+def _gam_terms():
+    return s(0, n_splines=15) + s(1, n_splines=15) + s(2) + s(3) + s(4) + s(5)
+
+
+# Fit GAM + Isotonic Recalibration on One Fold
+def _fit_gam_fold(X, y, train_idx, test_idx):
+    X_train, X_test = X[train_idx], X[test_idx]
+    y_train = y[train_idx]
+
+    # Fit GAM on training fold
+    gam_fold = LogisticGAM(_gam_terms()).fit(X_train, y_train)
+
+    # Fit isotonic regression on training fold predictions
+    ir = IsotonicRegression(out_of_bounds="clip")
+    ir.fit(gam_fold.predict_proba(X_train), y_train)
+
+    # Recalibrated test fold probabilities
+    return ir.transform(gam_fold.predict_proba(X_test))
+
+
+# Fit GAM + Isotonic Recalibration on the Full Dataset
+def _fit_gam_full(X, y):
+    gam = LogisticGAM(_gam_terms()).fit(X, y)
+
+    ir_full = IsotonicRegression(out_of_bounds="clip")
+    ir_full.fit(gam.predict_proba(X), y)
+
+    return gam, ir_full.transform(gam.predict_proba(X))
+
+
+# Share Arrays With Worker Processes (memory-mapped, read-only)
+def _memmap_arrays(folder, **arrays):
+    shared = []
+    for name, array in arrays.items():
+        path = os.path.join(folder, f"{name}.joblib")
+        joblib.dump(np.ascontiguousarray(array), path)
+        shared.append(joblib.load(path, mmap_mode="r"))
+    return shared
+
+
+# Blocked Spatiotemporal CV (folds in parallel)
+def fit_gam_blocked_cv(df, groups, n_splits=5, n_jobs=-1):
+    """
+    Fit a LogisticGAM with blocked spatiotemporal CV and isotonic recalibration.
+
+    Folds (and the final full-data fit) run in a process pool. The feature
+    matrix and labels are written once to memory-mapped files that every
+    worker reads, instead of being pickled per task; results are collected
+    in fold order, so the output is identical to the sequential path
+    (`n_jobs=1`).
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Must include 'LATITUDE','LONGITUDE','DOY_SIN','DOY_COS','MONTH_SIN','MONTH_COS',
+        'orca_present','YEAR_WEEK'
+    groups : array-like
+        Grouping variable for blocked CV (e.g., H3_PARENT or YEAR_WEEK)
+    n_splits : int
+        Number of CV folds
+    n_jobs : int
+        Worker processes (-1 uses all cores, 1 runs sequentially)
+
+    Returns:
+    --------
+    gam : fitted LogisticGAM on full dataset
+    df : original df with 'proba_gam' column (calibrated)
+    cv_results : pd.DataFrame with 'YEAR_WEEK','y_true','y_pred','fold' (calibrated)
+    """
+    X = df[GAM_FEATURES].values
+    y = df["orca_present"].values
+
+    gkf = GroupKFold(n_splits=n_splits)
+    splits = list(gkf.split(X, y, groups=groups))
+
+    with tempfile.TemporaryDirectory() as folder:
+        X_shared, y_shared = X, y
+        if n_jobs != 1:
+            X_shared, y_shared = _memmap_arrays(folder, X=X, y=y)
+
+        # Folds + Full Fit as Independent Tasks
+        outputs = Parallel(n_jobs=n_jobs)(
+            [
+                delayed(_fit_gam_fold)(X_shared, y_shared, train_idx, test_idx)
+                for train_idx, test_idx in splits
+            ]
+            + [delayed(_fit_gam_full)(X_shared, y_shared)]
+        )
+
+    # Store CV fold results
+    results = []
+    for fold, ((_, test_idx), y_pred_cal) in enumerate(zip(splits, outputs[:-1])):
+        results.append(
+            pd.DataFrame(
+                {
+                    "YEAR_WEEK": df.iloc[test_idx]["YEAR_WEEK"],
+                    "y_true": y[test_idx],
+                    "y_pred": y_pred_cal,
+                    "fold": fold,
+                }
+            )
+        )
+    cv_results = pd.concat(results, ignore_index=True)
+
+    # Final GAM + calibrated probabilities on the full dataset
+    gam, proba_gam = outputs[-1]
+    df["proba_gam"] = proba_gam
+
+    return gam, df, cv_results
+
+
+#                                           #
+# ----------------------------------------- #
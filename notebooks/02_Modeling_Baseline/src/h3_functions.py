@@ -0,0 +1,110 @@
+# ----------------------------------------- #
+#                  MODULES                  #
+
+# Standard Modules
+import os
+
+# Third-Party Modules
+import h3
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+
+#                                           #
+# ----------------------------------------- #
+
+# ----------------------------------------- #
+#                 FUNCTIONS                 #
+
+
+# Index a Chunk of (Unique) Coordinates
+def _latlng_chunk_to_cells(lats, lngs, resolution):
+    return [h3.latlng_to_cell(lat, lng, resolution) for lat, lng in zip(lats, lngs)]
+
+
+# Batch H3 Indexer
+def latlng_to_cells(
+    lats, lngs, resolution, n_jobs=1, min_chunk_size=50_000, as_category=False
+):
+    """
+    Assign H3 cells to arrays of latitude/longitude in one batch.
+
+    Coordinates are deduplicated before calling h3, so repeated positions
+    (e.g. multiple reports from the same vessel or expanded COUNT rows) are
+    only indexed once. Large batches of unique coordinates can be spread
+    over a process pool.
+
+    Parameters:
+        lats (array-like): Latitudes in decimal degrees.
+        lngs (array-like): Longitudes in decimal degrees.
+        resolution (int): Target H3 resolution.
+        n_jobs (int): Number of worker processes (-1 uses all cores).
+        min_chunk_size (int): Minimum unique coordinates per worker chunk.
+        as_category (bool): Return a pd.Categorical (1-D input only), coded
+            from the deduplicated coordinates without rehashing cell strings.
+
+    Returns:
+        np.ndarray: H3 cell ids (object array of str), aligned with the input.
+    """
+    lats = np.asarray(lats, dtype=np.float64)
+    lngs = np.asarray(lngs, dtype=np.float64)
+
+    if lats.shape != lngs.shape:
+        raise ValueError("lats and lngs must have the same shape.")
+    if lats.size == 0:
+        return np.array([], dtype=object)
+
+    # Deduplicate Coordinates (hash lat/lon pairs packed as complex numbers)
+    inverse, unique_coords = pd.factorize(
+        lats.ravel() + 1j * lngs.ravel(), use_na_sentinel=False
+    )
+    unique_coords = np.column_stack([unique_coords.real, unique_coords.imag])
+
+    # Split Unique Coordinates Across Workers
+    n_workers = os.cpu_count() if n_jobs == -1 else max(int(n_jobs), 1)
+    n_chunks = min(n_workers, max(len(unique_coords) // min_chunk_size, 1))
+
+    if n_chunks == 1:
+        unique_cells = _latlng_chunk_to_cells(
+            unique_coords[:, 0], unique_coords[:, 1], resolution
+        )
+    else:
+        chunks = np.array_split(unique_coords, n_chunks)
+        results = Parallel(n_jobs=n_chunks)(
+            delayed(_latlng_chunk_to_cells)(chunk[:, 0], chunk[:, 1], resolution)
+            for chunk in chunks
+        )
+        unique_cells = [cell for result in results for cell in result]
+
+    unique_cells = np.asarray(unique_cells, dtype=object)
+
+    if as_category:
+        # Nearby coordinates share cells - code the (few) unique cells once
+        cell_codes, categories = pd.factorize(unique_cells)
+        return pd.Categorical.from_codes(cell_codes[inverse], categories=categories)
+
+    return unique_cells[inverse].reshape(lats.shape)
+
+
+# Assign H3 Cells to a DataFrame
+def assign_h3_cells(
+    data,
+    resolution,
+    lat_col="LATITUDE",
+    lon_col="LONGITUDE",
+    h3_col="H3_CELL",
+    n_jobs=1,
+    as_category=False,
+):
+    data[h3_col] = latlng_to_cells(
+        data[lat_col].to_numpy(),
+        data[lon_col].to_numpy(),
+        resolution,
+        n_jobs=n_jobs,
+        as_category=as_category,
+    )
+    return data
+
+
+#                                           #
+# ----------------------------------------- #
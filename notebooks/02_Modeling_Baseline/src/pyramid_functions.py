@@ -0,0 +1,152 @@
+# ----------------------------------------- #
+#                  MODULES                  #
+
+# Third-Party Modules
+import geopandas as gpd
+import h3
+import numpy as np
+import pandas as pd
+
+# Built Modules
+from common.h3_geometry_functions import cells_to_polygons
+
+#                                           #
+# ----------------------------------------- #
+
+# ----------------------------------------- #
+#                PARAMETERS                 #
+
+# Default Map Budget (hexagons sent to the browser per view)
+MAP_MAX_CELLS = 5_000
+
+#                                           #
+# ----------------------------------------- #
+
+# ----------------------------------------- #
+#                 FUNCTIONS                 #
+
+
+# Distinct Cells of a Pyramid Level With Their Centroids
+def _level_cells(cells):
+    centers = np.array([h3.cell_to_latlng(cell) for cell in cells]).reshape(-1, 2)
+    return pd.DataFrame(
+        {"H3_CELL": cells, "LATITUDE": centers[:, 0], "LONGITUDE": centers[:, 1]}
+    )
+
+
+# Roll Cell Values Up to Parent Resolutions
+def build_h3_pyramid(
+    data, aggregations, h3_col="H3_CELL", by=None, min_resolution=None
+):
+    """
+    Aggregate cell-level rows to their own and every coarser H3 resolution.
+
+    Distinct cells are factorized once and each level's parents come from
+    the previous level's (few) distinct cells with `cell_to_parent`, so the
+    rows are only regrouped by integer codes. Every level aggregates the
+    original rows (a coarse "mean" is the mean over all fine rows).
+
+    Parameters:
+        data (pd.DataFrame): Cell-level rows (same resolution).
+        aggregations (dict): Output column -> (column, aggregation), as in
+            pandas named aggregation, e.g. {"PROBA_MAX": ("proba", "max")}.
+        h3_col (str): H3 cell column.
+        by (list, optional): Extra keys kept at every level (e.g. ["DATE"]).
+        min_resolution (int, optional): Coarsest level (default: four
+            levels above the data resolution).
+
+    Returns:
+        dict: Resolution -> pd.DataFrame with [by...,] H3_CELL, LATITUDE,
+        LONGITUDE (cell center), N_ROWS and the aggregated columns (empty
+        dict if no row has a cell).
+    """
+    by = list(by or [])
+    data = data[data[h3_col].notna()]
+    codes, cells = pd.factorize(np.asarray(data[h3_col], dtype=object))
+    cells = np.asarray(cells, dtype=object)
+    if len(cells) == 0:
+        return {}
+
+    resolution = h3.get_resolution(cells[0])
+    if min_resolution is None:
+        min_resolution = max(resolution - 4, 0)
+
+    pyramid = {}
+    for level in range(resolution, min_resolution - 1, -1):
+        if level < resolution:
+            # Parents of this level's distinct cells, then regroup the rows
+            parent_codes, cells = pd.factorize(
+                np.array(
+                    [h3.cell_to_parent(cell, level) for cell in cells], dtype=object
+                )
+            )
+            cells = np.asarray(cells, dtype=object)
+            codes = parent_codes[codes]
+
+        keys = [data[col].to_numpy() for col in by] + [codes]
+        grouped = data.groupby(keys, sort=False).agg(
+            N_ROWS=(h3_col, "size"), **aggregations
+        )
+        grouped.index.names = [*by, "CELL_CODE"]
+        grouped = grouped.reset_index()
+
+        cell_frame = _level_cells(cells)
+        grouped = pd.concat(
+            [
+                grouped[by].reset_index(drop=True),
+                cell_frame.iloc[grouped["CELL_CODE"].to_numpy()].reset_index(drop=True),
+                grouped.drop(columns=[*by, "CELL_CODE"]),
+            ],
+            axis=1,
+        )
+        pyramid[level] = grouped
+
+    return pyramid
+
+
+# Pick the Pyramid Level for a Map View
+def pyramid_view(pyramid, bounds=None, max_cells=MAP_MAX_CELLS):
+    """
+    Rows of the finest pyramid level that stays within the cell budget of
+    a map viewport, with hexagon geometries.
+
+    Parameters:
+        pyramid (dict): Output of `build_h3_pyramid` (filtered to one map
+            frame, e.g. a single DATE).
+        bounds (tuple, optional): Viewport (min_lon, min_lat, max_lon,
+            max_lat) - default: whole extent.
+        max_cells (int): Maximum distinct hexagons to draw.
+
+    Returns:
+        gpd.GeoDataFrame: Level rows (cells centered in the viewport) with
+        H3_RESOLUTION and geometry columns (empty for an empty pyramid).
+    """
+    if not pyramid:
+        return gpd.GeoDataFrame(
+            columns=["H3_CELL", "LATITUDE", "LONGITUDE", "H3_RESOLUTION"],
+            geometry=[],
+            crs="EPSG:4326",
+        )
+
+    for resolution in sorted(pyramid, reverse=True):
+        level = pyramid[resolution]
+        in_view = np.ones(len(level), dtype=bool)
+        if bounds is not None:
+            min_lon, min_lat, max_lon, max_lat = bounds
+            in_view = level["LONGITUDE"].between(min_lon, max_lon).to_numpy() & (
+                level["LATITUDE"].between(min_lat, max_lat).to_numpy()
+            )
+        if level.loc[in_view, "H3_CELL"].nunique() <= max_cells:
+            break
+
+    # Coarsest level is used even if it exceeds the budget
+    view = level[in_view].reset_index(drop=True)
+    view["H3_RESOLUTION"] = resolution
+
+    codes, cells = pd.factorize(view["H3_CELL"])
+    geometry = cells_to_polygons(np.asarray(cells, dtype=object))[codes]
+    return gpd.GeoDataFrame(view, geometry=geometry, crs="EPSG:4326")
+
+
+#                                           #
+# ----------------------------------------- #
@@ -0,0 +1,160 @@
+# ----------------------------------------- #
+#                  MODULES                  #
+
+# Third-Party Modules
+import h3
+import numpy as np
+import pandas as pd
+
+#                                           #
+# ----------------------------------------- #
+
+# ----------------------------------------- #
+#                 FUNCTIONS                 #
+
+
+# Draw Distinct Keys in [0, n_space) Outside `excluded` (rejection sampling)
+def _sample_absent_keys(rng, n_space, n_samples, excluded):
+    """
+    Sample `n_samples` distinct integers from [0, n_space) not in `excluded`.
+
+    Draws are made in batches and rejected against a hashed set of the
+    excluded (and already accepted) keys, so cost scales with the sample size
+    rather than n_space. If most of the space is requested, the absent keys
+    are enumerated instead.
+    """
+    seen = set(np.asarray(excluded).tolist())
+    n_available = n_space - len(seen)
+    n_samples = min(n_samples, n_available)
+
+    if n_samples <= 0:
+        return np.array([], dtype=np.int64)
+    if n_samples * 2 >= n_available:
+        absent = np.setdiff1d(np.arange(n_space, dtype=np.int64), list(seen))
+        return np.sort(rng.choice(absent, n_samples, replace=False))
+
+    keys = []
+    while len(keys) < n_samples:
+        n_draw = int((n_samples - len(keys)) * n_space / n_available * 1.2) + 16
+        for key in rng.integers(0, n_space, n_draw).tolist():
+            if key not in seen:
+                seen.add(key)
+                keys.append(key)
+                if len(keys) == n_samples:
+                    break
+
+    return np.sort(np.array(keys, dtype=np.int64))
+
+
+# Pseudo-Absence Sampler (week x cell index space)
+def generate_pseudo_absences(
+    df,
+    h3_cells=None,
+    weeks=None,
+    max_ratio=2,
+    random_state=42,
+    stratify=None,
+    region_resolution=3,
+):
+    """
+    Add pseudo-absences to presence records without building the full grid.
+
+    (week, cell) pairs are encoded as `week_index * n_cells + cell_index` and
+    absences are drawn directly in that integer space, rejecting observed
+    presences, so memory and time scale with the sample rather than with
+    weeks x cells. Results are reproducible for a given `random_state`.
+
+    Parameters:
+        df (pd.DataFrame): Sightings with 'YEAR_WEEK' and 'H3_CELL'.
+        h3_cells (list, optional): All possible H3 cells (default: observed).
+        weeks (list, optional): All possible weeks (default: observed).
+        max_ratio (float): Maximum pseudo-absences per presence.
+        random_state (int): Seed for the sampler.
+        stratify (str, optional): None (whole space), "week" (max_ratio per
+            presence within each week) or "region" (within each H3 parent
+            cell at `region_resolution`).
+        region_resolution (int): Parent resolution for `stratify="region"`.
+
+    Returns:
+        pd.DataFrame: YEAR_WEEK, H3_CELL and orca_present (1 for each
+        presence record, 0 for sampled absences).
+    """
+    rng = np.random.default_rng(random_state)
+
+    # unique H3/week
+    if h3_cells is None:
+        h3_cells = df["H3_CELL"].unique()
+    if weeks is None:
+        weeks = df["YEAR_WEEK"].unique()
+    h3_cells, weeks = pd.Index(h3_cells), pd.Index(weeks)
+    n_cells = len(h3_cells)
+
+    # Presence Keys (records outside the given weeks/cells are dropped)
+    week_idx = weeks.get_indexer(df["YEAR_WEEK"])
+    cell_idx = h3_cells.get_indexer(df["H3_CELL"])
+    observed = (week_idx >= 0) & (cell_idx >= 0)
+    presence_keys = np.sort(
+        week_idx[observed].astype(np.int64) * n_cells + cell_idx[observed],
+        kind="stable",
+    )
+
+    # Strata: (week indices, cell indices) sub-grids, each with its presences
+    presence_weeks, presence_cells = presence_keys // n_cells, presence_keys % n_cells
+    all_weeks, all_cells = np.arange(len(weeks)), np.arange(n_cells)
+
+    if stratify is None:
+        strata = {0: (all_weeks, all_cells)}
+        presence_strata = np.zeros(len(presence_keys), dtype=np.int64)
+    elif stratify == "week":
+        strata = {w: (np.array([w]), all_cells) for w in np.unique(presence_weeks)}
+        presence_strata = presence_weeks
+    elif stratify == "region":
+        regions = [h3.cell_to_parent(cell, region_resolution) for cell in h3_cells]
+        region_codes, _ = pd.factorize(np.array(regions, dtype=object))
+        presence_strata = region_codes[presence_cells]
+        strata = {
+            r: (all_weeks, np.flatnonzero(region_codes == r))
+            for r in np.unique(presence_strata)
+        }
+    else:
+        raise ValueError(f"Unsupported stratify option: {stratify}")
+
+    # Sample max_ratio Absences per Presence Within Each Stratum
+    order = np.argsort(presence_strata, kind="stable")
+    stratum_ids, starts = np.unique(presence_strata[order], return_index=True)
+
+    absence_keys = [np.array([], dtype=np.int64)]
+    for stratum, positions in zip(stratum_ids, np.split(order, starts[1:])):
+        stratum_weeks, stratum_cells = strata[stratum]
+        n_stratum_cells = len(stratum_cells)
+
+        # Presences in the stratum's local (week, cell) index space (sorted ids)
+        week_pos = np.searchsorted(stratum_weeks, presence_weeks[positions])
+        cell_pos = np.searchsorted(stratum_cells, presence_cells[positions])
+        local_keys = week_pos * n_stratum_cells + cell_pos
+        local_absences = _sample_absent_keys(
+            rng,
+            len(stratum_weeks) * n_stratum_cells,
+            int(max_ratio * len(positions)),
+            local_keys,
+        )
+        absence_keys.append(
+            stratum_weeks[local_absences // n_stratum_cells] * n_cells
+            + stratum_cells[local_absences % n_stratum_cells]
+        )
+    absence_keys = np.sort(np.concatenate(absence_keys))
+
+    keys = np.concatenate([presence_keys, absence_keys])
+    return pd.DataFrame(
+        {
+            "YEAR_WEEK": weeks[keys // n_cells],
+            "H3_CELL": h3_cells[keys % n_cells],
+            "orca_present": np.repeat(
+                [1.0, 0.0], [len(presence_keys), len(absence_keys)]
+            ),
+        }
+    )
+
+
+#                                           #
+# ----------------------------------------- #
@@ -0,0 +1,243 @@
+# ----------------------------------------- #
+#                  MODULES                  #
+
+# Third-Party Modules
+import h3
+import h3.api.numpy_int as h3_int
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+#                                           #
+# ----------------------------------------- #
+
+# ----------------------------------------- #
+#                PARAMETERS                 #
+
+# Earth Radius (km)
+EARTH_RADIUS_KM = 6371
+
+# Smoothing Operators, keyed by (resolution, sigma_km, truncate) -> last
+# (cells, operator) built for them (see `clear_smoothing_cache`)
+_OPERATOR_CACHE = {}
+
+# Cells per Batch of Disks Gathered at Once
+OPERATOR_CHUNK_CELLS = 1_000
+
+#                                           #
+# ----------------------------------------- #
+
+# ----------------------------------------- #
+#                 FUNCTIONS                 #
+
+
+# Haversine Distance (km) Between Paired Points
+def _haversine_km(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+# Centroids (lat, lon) of H3 Cells - one h3 call per unique cell
+def _cell_centroids(cells):
+    return np.array([h3.cell_to_latlng(cell) for cell in cells]).reshape(-1, 2)
+
+
+# Rings Needed to Cover a Radius Around a Cell
+def _disk_rings(cell, radius_km):
+    # True centre-to-centre spacing, measured around the cell (H3 cell size
+    # varies over the globe but barely within one region)
+    lat, lon = h3.cell_to_latlng(cell)
+    ring = _cell_centroids(h3.grid_ring(cell, 1))
+    spacing_km = _haversine_km(lat, lon, ring[:, 0], ring[:, 1]).min()
+
+    # Ring k is a hexagon whose closest points (edge midpoints) are
+    # k * spacing * sqrt(3) / 2 away
+    return max(int(np.ceil(radius_km / (spacing_km * np.sqrt(3) / 2))), 1)
+
+
+# Forget Cached Smoothing Operators
+def clear_smoothing_cache():
+    _OPERATOR_CACHE.clear()
+
+
+# Sparse H3 Gaussian Smoothing Operator
+def h3_smoothing_operator(cells, sigma_km=5, truncate=4.0):
+    """
+    Row-normalized Gaussian smoothing operator over a set of H3 cells.
+
+    Each cell only looks at cells within `truncate * sigma_km` (an H3
+    `grid_disk` sized for that radius), so the operator is a sparse CSR
+    matrix with O(N) entries instead of the dense N x N haversine/weight
+    matrices. Disks are intersected with `cells` before any distance is
+    computed (cells outside carry no weight, as in the dense version), and
+    centroids are computed once per cell. The last operator per
+    (resolution, sigma_km, truncate) is cached and reused for the same
+    cells; `clear_smoothing_cache` drops them.
+
+    Parameters:
+        cells (array-like): H3 cells (same resolution) - rows/columns order.
+        sigma_km (float): Gaussian bandwidth in km.
+        truncate (float): Kernel radius in standard deviations (weights
+            beyond 4 sigma are < 0.04% of the peak).
+
+    Returns:
+        scipy.sparse.csr_matrix: (n_cells, n_cells) weights; rows sum to 1.
+    """
+    cells = pd.Index(cells)
+    if len(cells) == 0:
+        return sparse.csr_matrix((0, 0))
+
+    resolution = h3.get_resolution(cells[0])
+    key = (resolution, sigma_km, truncate)
+    if key in _OPERATOR_CACHE and _OPERATOR_CACHE[key][0].equals(cells):
+        return _OPERATOR_CACHE[key][1]
+
+    radius_km = truncate * sigma_km
+    k = _disk_rings(cells[0], radius_km)
+    centroids = _cell_centroids(cells)
+
+    # Disks are gathered as integer cells (no per-member strings)
+    codes = pd.Index(
+        np.fromiter((h3.str_to_int(cell) for cell in cells), np.uint64, len(cells))
+    )
+
+    rows, cols, weights = [], [], []
+    for start in range(0, len(cells), OPERATOR_CHUNK_CELLS):
+        disks = [
+            h3_int.grid_disk(code, k)
+            for code in codes[start : start + OPERATOR_CHUNK_CELLS]
+        ]
+
+        # Disk members that are in `cells`, as (row, col) pairs
+        row = np.repeat(
+            np.arange(start, start + len(disks)), [len(disk) for disk in disks]
+        )
+        col = codes.get_indexer(np.concatenate(disks))
+        inside = col >= 0
+        row, col = row[inside], col[inside]
+
+        dist = _haversine_km(
+            centroids[row, 0], centroids[row, 1], centroids[col, 0], centroids[col, 1]
+        )
+        keep = dist <= radius_km
+        rows.append(row[keep])
+        cols.append(col[keep])
+        weights.append(np.exp(-(dist[keep] ** 2) / (2 * sigma_km**2)))
+
+    operator = sparse.csr_matrix(
+        (np.concatenate(weights), (np.concatenate(rows), np.concatenate(cols))),
+        shape=(len(cells), len(cells)),
+    )
+
+    # Normalize rows (each cell at least weighs itself)
+    row_sums = np.asarray(operator.sum(axis=1)).ravel()
+    operator = sparse.diags(1 / row_sums) @ operator
+
+    _OPERATOR_CACHE[key] = (cells, operator)
+    return operator
+
+
+# Circular Gaussian Smoothing Along the Period Axis (FFT)
+def smooth_circular(values, sigma, period=None, axis=-1):
+    """
+    Gaussian-smooth an array along a periodic axis (e.g. day of year).
+
+    The kernel wraps around the end of the period (Dec 31 neighbors Jan 1)
+    and is applied to every row at once as an FFT convolution.
+
+    Parameters:
+        values (np.ndarray): Array whose `axis` spans one full period.
+        sigma (float): Gaussian bandwidth in steps (e.g. days).
+        period (int, optional): Period length (default: size of `axis`).
+        axis (int): Periodic axis.
+
+    Returns:
+        np.ndarray: Smoothed array (kernel sums to 1, so totals are kept).
+    """
+    values = np.asarray(values, dtype=float)
+    period = period or values.shape[axis]
+    if values.shape[axis] != period:
+        raise ValueError(f"Axis {axis} must span the full period ({period}).")
+
+    offsets = np.arange(period)
+    offsets = np.minimum(offsets, period - offsets)
+    kernel = np.exp(-(offsets**2) / (2 * sigma**2))
+    kernel /= kernel.sum()
+
+    # Circular convolution (kernel is symmetric)
+    spectrum = np.fft.rfft(values, axis=axis)
+    shape = [1] * values.ndim
+    shape[axis] = -1
+    spectrum *= np.fft.rfft(kernel).reshape(shape)
+    return np.fft.irfft(spectrum, n=period, axis=axis)
+
+
+# Smooth a Cell Value Over Space (and Optionally Period) in One Pass
+def smooth_cell_values(
+    data,
+    value_col,
+    period_col,
+    sigma_km=5,
+    truncate=4.0,
+    h3_col="H3_CELL",
+    sigma_days=None,
+    period=366,
+):
+    """
+    Smooth `value_col` over space within each period (e.g. DOY), and
+    optionally over the (circular) period axis too.
+
+    Values are averaged to a cells x periods matrix (missing = 0), smoothed
+    with one sparse matmul by `h3_smoothing_operator` and, if `sigma_days`
+    is given, by `smooth_circular` along periods 1..`period` - a separable
+    space-time Gaussian.
+
+    Parameters:
+        data (pd.DataFrame): Rows with h3_col, period_col and value_col.
+        value_col (str): Column to smooth.
+        period_col (str): Period column (1-based, e.g. DOY or WOY).
+        sigma_km (float): Gaussian bandwidth in km.
+        truncate (float): Kernel radius in standard deviations.
+        h3_col (str): H3 cell column.
+        sigma_days (float, optional): Bandwidth along the period axis, in
+            periods (no temporal smoothing if None).
+        period (int): Number of periods in a cycle (366 for DOY, 53 for WOY).
+
+    Returns:
+        pd.DataFrame: `data` with a `{value_col}_smooth` column.
+    """
+    cells = data[h3_col].unique()
+    grid = (
+        data.pivot_table(
+            index=h3_col, columns=period_col, values=value_col, dropna=False
+        )
+        .reindex(cells)
+        .fillna(0)
+    )
+
+    # Full cycle of periods so the temporal kernel wraps correctly
+    if sigma_days is not None:
+        grid = grid.reindex(columns=range(1, period + 1), fill_value=0)
+        if grid.columns.get_indexer(data[period_col].unique()).min() < 0:
+            raise ValueError(f"{period_col} values must lie in 1..{period}.")
+
+    operator = h3_smoothing_operator(cells, sigma_km=sigma_km, truncate=truncate)
+    smoothed = operator @ grid.to_numpy()
+
+    if sigma_days is not None:
+        smoothed = smooth_circular(smoothed, sigma_days, period=period, axis=1)
+
+    # Gather back to rows
+    cell_idx = pd.Index(cells).get_indexer(data[h3_col])
+    period_idx = grid.columns.get_indexer(data[period_col])
+    data[f"{value_col}_smooth"] = smoothed[cell_idx, period_idx]
+
+    return data
+
+
+#                                           #
+# ----------------------------------------- #
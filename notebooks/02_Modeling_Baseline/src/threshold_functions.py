@@ -0,0 +1,133 @@
+# ----------------------------------------- #
+#                  MODULES                  #
+
+# Third-Party Modules
+import numpy as np
+import pandas as pd
+
+#                                           #
+# ----------------------------------------- #
+
+# ----------------------------------------- #
+#                 FUNCTIONS                 #
+
+
+# Safe Ratio (0 where the denominator is 0, as sklearn's zero_division=0)
+def _ratio(num, den):
+    return np.divide(num, den, out=np.zeros_like(num, dtype=float), where=den > 0)
+
+
+# Confusion Counts for Every Threshold (and group) at Once
+def threshold_counts(y_true, y_score, thresholds, sample_weight=None, groups=None):
+    """
+    Weighted TP/FP/FN/TN of `y_score >= t` for every threshold t.
+
+    Each score is placed once among the sorted thresholds (the number of
+    thresholds it clears); per-group histograms of that position are then
+    reverse-cumulated, so the cost is O(N log T + G x T) instead of one
+    confusion matrix per threshold. NaN scores never clear a threshold.
+
+    Parameters:
+        y_true (array-like): Binary labels.
+        y_score (array-like): Scores / probabilities.
+        thresholds (array-like): Thresholds (any order).
+        sample_weight (array-like, optional): Per-row weights.
+        groups (array-like, optional): Batch key (e.g. H3 cell or horizon).
+
+    Returns:
+        tuple: (group labels, dict of TP/FP/FN/TN arrays of shape
+        (n_groups, n_thresholds) in the given threshold order).
+    """
+    y_true = np.asarray(y_true).astype(bool)
+    y_score = np.asarray(y_score, dtype=float)
+    weights = (
+        np.ones(len(y_score))
+        if sample_weight is None
+        else np.asarray(sample_weight, dtype=float)
+    )
+    thresholds = np.asarray(thresholds, dtype=float)
+    n_thresholds = len(thresholds)
+
+    if groups is None:
+        codes, labels = np.zeros(len(y_score), dtype=np.int64), np.array([None])
+    else:
+        codes, labels = pd.factorize(np.asarray(groups))
+    n_groups = len(labels)
+
+    # Number of (sorted) thresholds each score clears
+    order = np.argsort(thresholds, kind="stable")
+    n_cleared = np.searchsorted(thresholds[order], y_score, side="right")
+    n_cleared[np.isnan(y_score)] = 0
+
+    # Weighted label histograms per (group, n_cleared)
+    bins = codes * (n_thresholds + 1) + n_cleared
+    size = n_groups * (n_thresholds + 1)
+    pos = np.bincount(bins, weights=weights * y_true, minlength=size)
+    neg = np.bincount(bins, weights=weights * ~y_true, minlength=size)
+    pos = pos.reshape(n_groups, n_thresholds + 1)
+    neg = neg.reshape(n_groups, n_thresholds + 1)
+
+    # Predicted positive at sorted threshold j <=> clears more than j thresholds
+    rank = np.argsort(order)
+    tp = np.cumsum(pos[:, ::-1], axis=1)[:, ::-1][:, 1:][:, rank]
+    fp = np.cumsum(neg[:, ::-1], axis=1)[:, ::-1][:, 1:][:, rank]
+
+    counts = {
+        "TP": tp,
+        "FP": fp,
+        "FN": pos.sum(axis=1, keepdims=True) - tp,
+        "TN": neg.sum(axis=1, keepdims=True) - fp,
+    }
+    return labels, counts
+
+
+# Threshold Sweep - Confusion Counts + Classification Metrics
+def threshold_metrics(
+    y_true, y_score, thresholds=None, sample_weight=None, groups=None
+):
+    """
+    Accuracy, precision, recall, F1 and confusion counts for every threshold
+    in one pass (see `threshold_counts`).
+
+    Parameters:
+        y_true (array-like): Binary labels.
+        y_score (array-like): Scores / probabilities.
+        thresholds (array-like, optional): Thresholds to evaluate
+            (default: every distinct score).
+        sample_weight (array-like, optional): Per-row weights.
+        groups (array-like, optional): Evaluate each group (cell, horizon, ...)
+            separately; adds a GROUP column.
+
+    Returns:
+        pd.DataFrame: [GROUP,] THRESHOLD, TP, FP, FN, TN, ACCURACY, PRECISION,
+        RECALL, F1 - one row per (group, threshold).
+    """
+    if thresholds is None:
+        y_score = np.asarray(y_score, dtype=float)
+        thresholds = np.unique(y_score[~np.isnan(y_score)])
+    thresholds = np.asarray(thresholds, dtype=float)
+
+    labels, counts = threshold_counts(
+        y_true, y_score, thresholds, sample_weight=sample_weight, groups=groups
+    )
+    tp, fp, fn, tn = counts["TP"], counts["FP"], counts["FN"], counts["TN"]
+
+    metrics = {
+        "THRESHOLD": np.tile(thresholds, len(labels)),
+        "TP": tp.ravel(),
+        "FP": fp.ravel(),
+        "FN": fn.ravel(),
+        "TN": tn.ravel(),
+        "ACCURACY": _ratio(tp + tn, tp + fp + fn + tn).ravel(),
+        "PRECISION": _ratio(tp, tp + fp).ravel(),
+        "RECALL": _ratio(tp, tp + fn).ravel(),
+        "F1": _ratio(2 * tp, 2 * tp + fp + fn).ravel(),
+    }
+    if groups is not None:
+        metrics = {"GROUP": np.repeat(labels, len(thresholds)), **metrics}
+
+    return pd.DataFrame(metrics)
+
+
+#                                           #
+# ----------------------------------------- #
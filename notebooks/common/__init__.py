@@ -0,0 +1,2 @@
+# Helpers shared by the data processing and modeling notebooks
+# (a regular package, so it never merges with a stage's `src`).
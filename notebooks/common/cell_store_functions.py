@@ -0,0 +1,239 @@
+# ----------------------------------------- #
+#                  MODULES                  #
+
+# Standard Modules
+import os
+import warnings
+
+# Third-Party Modules
+import geopandas as gpd
+import h3
+import numpy as np
+import pandas as pd
+import shapely
+
+# Built Modules
+from common.h3_geometry_functions import cells_to_polygons
+
+#                                           #
+# ----------------------------------------- #
+
+# ----------------------------------------- #
+#                PARAMETERS                 #
+
+# Cell Store File (one GeoParquet per resolution)
+CELL_STORE_FILE = "H3_CELLS_R{resolution}.parquet"
+
+# Store Columns (plus PARENT_R<res> columns)
+CELL_STORE_COLUMNS = [
+    "CELL",
+    "CELL_CODE",
+    "LATITUDE",
+    "LONGITUDE",
+    "AREA_KM2",
+    "WATER_FRACTION",
+    "geometry",
+]
+
+# Loaded Stores, keyed by (path, modification time, columns)
+_STORE_CACHE = {}
+
+#                                           #
+# ----------------------------------------- #
+
+# ----------------------------------------- #
+#                 FUNCTIONS                 #
+
+
+# Cell Store Path for a Resolution
+def cell_store_path(cache_dir, resolution):
+    return os.path.join(cache_dir, CELL_STORE_FILE.format(resolution=resolution))
+
+
+# Integer Codes of H3 Cell Ids
+def _cell_codes(cells):
+    return np.fromiter(
+        (h3.str_to_int(cell) for cell in cells), dtype=np.int64, count=len(cells)
+    )
+
+
+# Cell Attributes Computed Directly From h3 (no store)
+def _cell_records(cells, parent_resolutions=()):
+    cells = np.asarray(cells, dtype=object)
+    centers = np.array([h3.cell_to_latlng(cell) for cell in cells]).reshape(-1, 2)
+
+    records = {
+        "CELL": cells,
+        "CELL_CODE": _cell_codes(cells),
+        "LATITUDE": centers[:, 0],
+        "LONGITUDE": centers[:, 1],
+        "AREA_KM2": np.array([h3.cell_area(cell, unit="km^2") for cell in cells]),
+        "WATER_FRACTION": np.full(len(cells), np.nan),
+    }
+    for parent in parent_resolutions:
+        records[f"PARENT_R{parent}"] = np.array(
+            [h3.cell_to_parent(cell, parent) for cell in cells], dtype=object
+        )
+    return records
+
+
+# Build the Cell Store (centroid, boundary, area, water fraction, parents)
+def build_cell_store(cells, clipped_geometry=None, parent_resolutions=None):
+    """
+    Per-cell attributes for one H3 resolution, computed once.
+
+    Parameters:
+        cells (array-like): H3 cells (same resolution), e.g. the water AOI grid.
+        clipped_geometry (array-like, optional): Cell geometries clipped to the
+            water area, aligned with `cells`; WATER_FRACTION is the clipped /
+            full hexagon area ratio (NaN if not given).
+        parent_resolutions (list, optional): Parent resolutions to record as
+            PARENT_R<res> (default: the three coarser resolutions).
+
+    Returns:
+        gpd.GeoDataFrame: CELL, CELL_CODE, LATITUDE, LONGITUDE, AREA_KM2,
+        WATER_FRACTION, PARENT_R<res>..., geometry - sorted by CELL_CODE.
+    """
+    cells, first = np.unique(np.asarray(cells, dtype=object), return_index=True)
+    resolution = h3.get_resolution(cells[0])
+    if parent_resolutions is None:
+        parent_resolutions = range(resolution - 1, max(resolution - 4, -1), -1)
+
+    records = _cell_records(cells, parent_resolutions)
+    polygons = cells_to_polygons(cells)
+
+    if clipped_geometry is not None:
+        clipped = np.asarray(clipped_geometry, dtype=object)[first]
+        records["WATER_FRACTION"] = np.clip(
+            shapely.area(clipped) / shapely.area(polygons), 0, 1
+        )
+
+    store = gpd.GeoDataFrame(records, geometry=polygons, crs="EPSG:4326")
+    for col in store.columns:
+        if col.startswith("PARENT_R"):
+            store[col] = store[col].astype("category")
+
+    return store.sort_values("CELL_CODE", ignore_index=True)
+
+
+# Persist the Cell Store (GeoParquet)
+def write_cell_store(store, cache_dir):
+    resolution = h3.get_resolution(store["CELL"].iloc[0])
+    path = cell_store_path(cache_dir, resolution)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    store.to_parquet(f"{path}.part", index=False)
+    os.replace(f"{path}.part", path)
+
+    return path
+
+
+# Load the Cell Store (memory-mapped, once per process)
+def load_cell_store(resolution, cache_dir, columns=None):
+    """
+    Read the cell store of a resolution written by `write_cell_store`.
+
+    The file is memory-mapped and only `columns` are materialized (the
+    geometry is only decoded if requested); loaded stores are kept for the
+    rest of the session and reloaded when the file changes. Without a
+    store, an empty one is returned (with a warning) and `lookup_cells`
+    computes every cell directly.
+
+    Parameters:
+        resolution (int): H3 resolution.
+        cache_dir (str): Cell store directory.
+        columns (list, optional): Columns to load (CELL and CELL_CODE are
+            always loaded; default: all).
+
+    Returns:
+        pd.DataFrame: Store sorted by CELL_CODE (gpd.GeoDataFrame when the
+        geometry is loaded).
+    """
+    path = cell_store_path(cache_dir, resolution)
+    if columns is not None:
+        columns = [
+            "CELL",
+            "CELL_CODE",
+            *[c for c in columns if c not in ("CELL", "CELL_CODE")],
+        ]
+
+    if not os.path.exists(path):
+        warnings.warn(
+            f"No H3 cell store at {path} - cell attributes are computed on the "
+            "fly (build it with build_cell_store / write_cell_store)."
+        )
+        empty = {col: [] for col in columns or CELL_STORE_COLUMNS}
+        return pd.DataFrame(empty).astype({"CELL_CODE": np.int64})
+
+    key = (path, os.path.getmtime(path), None if columns is None else tuple(columns))
+    if key not in _STORE_CACHE:
+        if columns is None or "geometry" in columns:
+            store = gpd.read_parquet(path, columns=columns, memory_map=True)
+        else:
+            store = pd.read_parquet(path, columns=columns, memory_map=True)
+        _STORE_CACHE[key] = store
+
+    return _STORE_CACHE[key]
+
+
+# Vectorized Lookup of Cell Attributes
+def lookup_cells(store, cells, columns=None):
+    """
+    Gather store attributes for an array of cells (repeats allowed).
+
+    Distinct cells are converted to integer codes once and located in the
+    (sorted) CELL_CODE column by binary search. Cells missing from the store
+    (e.g. outside the AOI) get their centroid, area, parents and boundary
+    computed directly; their WATER_FRACTION is NaN. Null cells get an
+    all-NaN row.
+
+    Parameters:
+        store (pd.DataFrame): Cell store (see `load_cell_store`).
+        cells (array-like): H3 cells (str or categorical), e.g. df["H3_CELL"].
+        columns (list, optional): Columns to return (default: all but CELL
+            and CELL_CODE).
+
+    Returns:
+        pd.DataFrame: One row per input cell (same index as a Series input);
+        gpd.GeoDataFrame when geometry is requested.
+    """
+    if columns is None:
+        columns = [c for c in store.columns if c not in ("CELL", "CELL_CODE")]
+    index = cells.index if isinstance(cells, pd.Series) else None
+
+    # Distinct cells -> rows of the store
+    inverse, unique_cells = pd.factorize(np.asarray(cells, dtype=object))
+    unique_cells = np.asarray(unique_cells, dtype=object)
+    codes = _cell_codes(unique_cells)
+    store_codes = store["CELL_CODE"].to_numpy()
+    rows = np.searchsorted(store_codes, codes).clip(max=max(len(store) - 1, 0))
+    found = (
+        store_codes[rows] == codes if len(store) else np.zeros(len(codes), dtype=bool)
+    )
+
+    values = store.iloc[rows[found]][columns].reset_index(drop=True)
+    if not found.all():
+        parents = [
+            int(c[len("PARENT_R") :]) for c in columns if c.startswith("PARENT_R")
+        ]
+        missing = pd.DataFrame(_cell_records(unique_cells[~found], parents))
+        if "geometry" in columns:
+            missing["geometry"] = cells_to_polygons(unique_cells[~found])
+        values = pd.concat([values, missing[columns]], ignore_index=True)
+        values = values.iloc[
+            np.argsort(np.r_[np.flatnonzero(found), np.flatnonzero(~found)])
+        ].reset_index(drop=True)
+
+    # Null cells (code -1) -> the all-NaN row past the end
+    result = values.reindex(np.where(inverse < 0, len(values), inverse))
+    result = result.reset_index(drop=True)
+    if index is not None:
+        result.index = index
+    if "geometry" in columns:
+        result = gpd.GeoDataFrame(result, geometry="geometry", crs="EPSG:4326")
+
+    return result
+
+
+#                                           #
+# ----------------------------------------- #
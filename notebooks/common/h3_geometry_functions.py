@@ -0,0 +1,45 @@
+# ----------------------------------------- #
+#                  MODULES                  #
+
+# Third-Party Modules
+import h3
+import numpy as np
+import shapely
+
+#                                           #
+# ----------------------------------------- #
+
+# ----------------------------------------- #
+#                 FUNCTIONS                 #
+
+
+# Bulk H3 Cell Polygons
+def cells_to_polygons(cells):
+    """
+    Build shapely polygons for many H3 cells at once.
+
+    Cell boundaries are gathered into one (lng, lat) coordinate array and
+    turned into polygons with shapely's vectorized constructors, instead of
+    one `Polygon` per cell. Pentagons and distorted cells (more vertices)
+    are handled through the ring indices.
+
+    Parameters:
+        cells (array-like): H3 cell ids.
+
+    Returns:
+        np.ndarray: shapely Polygons (EPSG:4326), aligned with `cells`.
+    """
+    boundaries = [h3.cell_to_boundary(cell) for cell in cells]
+    if not boundaries:
+        return np.array([], dtype=object)
+
+    n_vertices = np.fromiter(map(len, boundaries), dtype=np.int64)
+    coords = np.array([latlng for boundary in boundaries for latlng in boundary])
+    rings = shapely.linearrings(
+        coords[:, ::-1], indices=np.repeat(np.arange(len(boundaries)), n_vertices)
+    )
+    return shapely.polygons(rings)
+
+
+#                                           #
+# ----------------------------------------- #